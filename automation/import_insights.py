@@ -10,7 +10,10 @@ import sys
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
-from automation.semantic_db import add_insight
+from automation.semantic_db import add_insight, add_insights
+
+# Insights embedded and written per add_insights call
+IMPORT_BATCH_SIZE = 100
 
 def import_insights(backup_file):
     """Import insights from JSON backup"""
@@ -29,22 +32,27 @@ def import_insights(backup_file):
     imported = 0
     skipped = 0
     
-    for i, insight in enumerate(insights, 1):
-        if i % 100 == 0:
-            print(f"  Progress: {i}/{len(insights)} ({imported} imported, {skipped} skipped)")
+    # Skip insights without required fields up front
+    valid = [insight for insight in insights if insight.get("text") and insight.get("topic")]
+    skipped += len(insights) - len(valid)
+    
+    for start in range(0, len(valid), IMPORT_BATCH_SIZE):
+        batch = valid[start:start + IMPORT_BATCH_SIZE]
         
         try:
-            # Skip insights without required fields
-            if not insight.get("text") or not insight.get("topic"):
-                skipped += 1
-                continue
-            
-            add_insight(insight)
-            imported += 1
-            
-        except Exception as e:
-            print(f"  ⚠️  Error importing insight {i}: {e}")
-            skipped += 1
+            add_insights(batch)
+            imported += len(batch)
+        except Exception:
+            # Retry one by one so a bad insight only skips itself
+            for i, insight in enumerate(batch, start + 1):
+                try:
+                    add_insight(insight)
+                    imported += 1
+                except Exception as e:
+                    print(f"  ⚠️  Error importing insight {i}: {e}")
+                    skipped += 1
+        
+        print(f"  Progress: {imported + skipped}/{len(insights)} ({imported} imported, {skipped} skipped)")
     
     print(f"\n✅ Import complete!")
     print(f"   Imported: {imported}")
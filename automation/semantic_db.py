@@ -4,7 +4,6 @@ import hashlib
 from datetime import datetime
 from typing import Dict, List, Optional
 import sqlite3
-import uuid
 
 import chromadb
 from chromadb.config import Settings
@@ -12,8 +11,11 @@ from sentence_transformers import SentenceTransformer
 import os
 from groq import Groq
 from functools import lru_cache
+from operator import itemgetter
 from dotenv import load_dotenv
 
+from backend.utils.database import UUID4_SQL
+
 # Load environment variables
 load_dotenv()
 
@@ -85,6 +87,47 @@ def _make_document_text(insight: Dict) -> str:
     return " | ".join(parts)
 
 
+# Row ids are random UUIDs generated by SQLite, not per row in Python
+_INSERT_INSIGHT_SQL = f"""
+    INSERT OR IGNORE INTO insights (
+        id, topic, category, text, source_url, source_domain,
+        quality_score, engagement_score, created_at, updated_at,
+        is_archived, chroma_id
+    ) VALUES ({UUID4_SQL}, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Column defaults for the SQLite row, merged under each insight in one step
+# instead of one .get() per field
+_INSIGHT_ROW_DEFAULTS = {
+    "topic": "",
+    "category": "",
+    "text": "",
+    "source_url": "",
+    "source_domain": "",
+    "quality_score": 0,
+}
+_insight_row_fields = itemgetter("topic", "category", "text", "source_url", "source_domain")
+
+
+def _make_metadata(insight: Dict) -> Dict:
+    """Build the ChromaDB metadata for an insight."""
+    metadata: Dict = {
+        "category": insight.get("category", ""),
+        "topic": insight.get("topic", ""),
+        "source_url": insight.get("source_url", ""),
+        "source_domain": insight.get("source_domain", ""),
+        "extracted_at": insight.get("extracted_at", ""),
+        "quality_score": float(insight.get("quality_score", 0.0)),
+    }
+    if insight.get("detected_year") is not None:
+        metadata["detected_year"] = int(insight["detected_year"])
+
+    # Add clean text to metadata for display (not just for embedding)
+    metadata["text"] = insight.get("text", "")
+
+    return metadata
+
+
 def add_insight(insight: Dict) -> str:
     """Add a single insight to the vector DB.
 
@@ -98,79 +141,74 @@ def add_insight(insight: Dict) -> str:
       - extracted_at (str ISO, optional)
       - detected_year (int, optional)
     """
-    insight_id = _make_insight_id(insight)
+    return add_insights([insight])[0]
+
 
-    # Check if already present
+def add_insights(insights: List[Dict]) -> List[str]:
+    """Add insights (see add_insight) to the vector DB and the feed table.
+
+    Work is batched: one ChromaDB lookup for existing ids, one embedding
+    call and one collection.add for the new insights, and one SQLite
+    executemany in a single transaction.
+
+    Returns the insight IDs in input order, including ones already present.
+    """
+    insight_ids = [_make_insight_id(insight) for insight in insights]
+
+    # Check which are already present
     try:
-        existing = collection.get(ids=[insight_id])
-        if existing.get("ids") and existing["ids"]:
-            # Already exists
-            return insight_id
+        existing = set(collection.get(ids=list(set(insight_ids)))["ids"]) if insight_ids else set()
     except Exception:
         # If collection.get fails for some reason, continue and attempt add
-        pass
+        existing = set()
 
-    doc = _make_document_text(insight)
-    embedding = model.encode(doc).tolist()
+    # New insights by ID (also drops repeats within the batch)
+    new_insights: Dict[str, Dict] = {}
+    for insight_id, insight in zip(insight_ids, insights):
+        if insight_id not in existing and insight_id not in new_insights:
+            new_insights[insight_id] = insight
 
-    metadata: Dict = {
-        "category": insight.get("category", ""),
-        "topic": insight.get("topic", ""),
-        "source_url": insight.get("source_url", ""),
-        "source_domain": insight.get("source_domain", ""),
-        "extracted_at": insight.get("extracted_at", ""),
-        "quality_score": float(insight.get("quality_score", 0.0)),
-    }
-    if insight.get("detected_year") is not None:
-        metadata["detected_year"] = int(insight["detected_year"])
+    if not new_insights:
+        return insight_ids
 
-    # Add clean text to metadata for display (not just for embedding)
-    metadata["text"] = insight.get("text", "")
+    docs = [_make_document_text(insight) for insight in new_insights.values()]
+    embeddings = model.encode(docs).tolist()
 
     collection.add(
-        ids=[insight_id],
-        embeddings=[embedding],
-        documents=[doc],
-        metadatas=[metadata],
+        ids=list(new_insights),
+        embeddings=embeddings,
+        documents=docs,
+        metadatas=[_make_metadata(insight) for insight in new_insights.values()],
     )
 
     # Also add to SQLite insights table for feed
+    now = datetime.now().isoformat()
     try:
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
 
-        sql_id = str(uuid.uuid4())
-        cursor.execute("""
-            INSERT INTO insights (
-                id, topic, category, text, source_url, source_domain,
-                quality_score, engagement_score, created_at, updated_at,
-                is_archived, chroma_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            sql_id,
-            insight.get("topic", ""),
-            insight.get("category", ""),
-            insight.get("text", ""),
-            insight.get("source_url", ""),
-            insight.get("source_domain", ""),
-            float(insight.get("quality_score", 0)),
-            0.0,  # engagement_score starts at 0
-            insight.get("extracted_at", datetime.now().isoformat()),
-            datetime.now().isoformat(),
-            0,  # not archived
-            insight_id  # chroma_id for reference
-        ))
+        # OR IGNORE: rows already in SQLite are fine
+        rows = []
+        for insight_id, insight in new_insights.items():
+            fields = {**_INSIGHT_ROW_DEFAULTS, **insight}
+            rows.append((
+                *_insight_row_fields(fields),
+                float(fields["quality_score"]),
+                0.0,  # engagement_score starts at 0
+                fields.get("extracted_at", now),
+                now,
+                0,  # not archived
+                insight_id  # chroma_id for reference
+            ))
+        cursor.executemany(_INSERT_INSIGHT_SQL, rows)
 
         conn.commit()
         conn.close()
-    except sqlite3.IntegrityError:
-        # Already exists in SQLite, that's fine
-        pass
     except Exception as e:
         # Log error but don't fail the whole operation
-        print(f"Warning: Failed to add insight to SQLite: {e}")
+        print(f"Warning: Failed to add insights to SQLite: {e}")
 
-    return insight_id
+    return insight_ids
 
 
 @lru_cache(maxsize=2000)
@@ -361,12 +399,7 @@ def add_insights_batch(insights: List[Dict], topic: str = "") -> List[str]:
     print(f"  ✅ Adding {len(unique_insights)}/{len(insights)} insights to DB")
 
     # Add unique, high-quality insights
-    added_ids = []
-    for insight in unique_insights:
-        insight_id = add_insight(insight)
-        added_ids.append(insight_id)
-
-    return added_ids
+    return add_insights(unique_insights)
 
 
 def search_insights(
@@ -14,7 +14,7 @@ from pydantic import BaseModel
 from automation.semantic_db import search_insights
 from backend.extraction_queue import ExtractionQueue
 from backend.semantic_search import find_similar_topic, get_topic_insight_count
-from backend.topic_validation import validate_topic
+from backend.topic_validation import load_known_topics, slm_batch_worker, slm_ready, validate_topic_async
 from backend.utils.logger import setup_logger
 import asyncio
 
@@ -28,6 +28,13 @@ logger = setup_logger(__name__)
 # Global extraction queue (initialized on startup)
 extraction_queue = None
 
+# Background refresh of insight_feed_mv freshness (started on startup)
+feed_mv_refresh_task = None
+FEED_MV_REFRESH_INTERVAL_SECONDS = 3600
+
+# Batched SLM topic validation worker (started on startup)
+slm_batch_task = None
+
 # Minimum insights threshold for topic readiness
 MIN_INSIGHTS_THRESHOLD = 30
 
@@ -81,7 +88,7 @@ def init_database():
     # Create user_engagement table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS user_engagement (
-            id TEXT PRIMARY KEY,
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id TEXT NOT NULL,
             insight_id TEXT NOT NULL,
             action TEXT NOT NULL,
@@ -152,10 +159,21 @@ def run_extraction(topic: str, user_id: str) -> dict:
         logger.error(f"Extraction error for topic '{topic}': {e}")
         raise
 
+async def refresh_feed_mv_periodically():
+    """Recompute cached freshness in insight_feed_mv on a fixed interval."""
+    while True:
+        try:
+            refreshed = await asyncio.to_thread(FeedService().refresh_feed_mv)
+            logger.info(f"Refreshed feed view freshness for {refreshed} insights")
+        except Exception as e:
+            logger.error(f"Feed view refresh failed: {e}")
+        await asyncio.sleep(FEED_MV_REFRESH_INTERVAL_SECONDS)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database, enable WAL mode, and recover stale extraction jobs."""
-    global extraction_queue
+    global extraction_queue, feed_mv_refresh_task, slm_batch_task
 
     logger.info("Starting up application...")
 
@@ -176,6 +194,13 @@ async def startup_event():
     init_database()
     logger.info("Database initialized")
 
+    # Topics users already follow skip rule-based validation
+    logger.info(f"Loaded {load_known_topics(DB_PATH)} known topics for validation")
+    # Deep (SLM) validations are batched by a worker; it only has work to do
+    # once a model has been loaded with init_slm()
+    if slm_ready():
+        slm_batch_task = asyncio.create_task(slm_batch_worker())
+
     # Initialize extraction queue with 2 workers
     logger.info("Initializing extraction queue...")
     extraction_queue = ExtractionQueue(num_workers=2, extraction_fn=run_extraction)
@@ -184,6 +209,9 @@ async def startup_event():
     logger.info("Checking for stale extraction jobs...")
     extraction_queue.recover_stale_jobs()
 
+    if UNIFIED_FEED_ENABLED:
+        feed_mv_refresh_task = asyncio.create_task(refresh_feed_mv_periodically())
+
     logger.info("Application startup complete")
 
 
@@ -194,6 +222,12 @@ async def shutdown_event():
 
     logger.info("Shutting down application...")
 
+    if feed_mv_refresh_task:
+        feed_mv_refresh_task.cancel()
+
+    if slm_batch_task:
+        slm_batch_task.cancel()
+
     if extraction_queue:
         logger.info("Stopping extraction queue...")
         extraction_queue.stop()
@@ -913,7 +947,7 @@ async def follow_topic(
 
     try:
         # Step 1: Validate topic
-        is_valid, error_message, suggestion = validate_topic(topic)
+        is_valid, error_message, suggestion = await validate_topic_async(topic)
 
         if not is_valid:
             return {
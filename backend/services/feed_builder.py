@@ -1,4 +1,5 @@
 """Feed Builder for diversity-aware feed composition"""
+import heapq
 import sqlite3
 from typing import Dict, List, Optional, Set, Tuple
 from backend.services.personalized_scorer import PersonalizedScorer
@@ -104,7 +105,7 @@ class FeedBuilder:
         1. **Insight-level dedup**: Already filtered in SQL
         2. **Batch load data**: User context (avoid N+1 queries)
         3. **Score**: Apply PersonalizedScorer to all candidates
-        4. **Sort**: Order by predicted score
+        4. **Rank**: Pop candidates by predicted score from a heap
         5. **Select with diversity**: Apply topic/category/source diversity rules
         6. **Inject exploration**: Add discovery items every 10th position
         """
@@ -116,22 +117,28 @@ class FeedBuilder:
 
         # Score all candidates
         context = FeedContext()
+        scores = self.scorer.score_batch(
+            candidates,
+            user_profile,
+            user_affinities,
+            topic_similarities,
+            context
+        )
         scored = [
-            (insight, self.scorer.score_insight(
-                insight,
-                user_profile,
-                user_affinities,
-                topic_similarities,
-                context
-            ))
-            for insight in candidates
+            (-float(score), idx, insight)
+            for idx, (score, insight) in enumerate(zip(scores, candidates))
         ]
-        scored.sort(key=lambda x: x[1], reverse=True)
+
+        # Lazy top-K: heapify is O(N) and we only pop as many items as the
+        # diversity walk consumes (ties keep candidate order, like a stable sort)
+        heapq.heapify(scored)
 
         # Select with diversity constraints
         feed = []
 
-        for insight, score in scored:
+        while scored:
+            _, _, insight = heapq.heappop(scored)
+
             # Topic diversity check
             if self._violates_topic_diversity(insight, context):
                 continue
@@ -188,8 +195,11 @@ class FeedBuilder:
         exclude_ids: Set[str]
     ) -> Optional[Dict]:
         """
-        Get random high-quality insight from topic user has 0 affinity with.
-        For discovery.
+        Get random high-quality, unseen insight from topic user has 0
+        affinity with. For discovery.
+
+        Seen insights are excluded with a NOT EXISTS anti-join on
+        user_engagement, like the main feed queries.
         """
         if not user_affinities:
             return None  # New user, nothing to exclude
@@ -206,12 +216,19 @@ class FeedBuilder:
         # Get random high-quality insight from unfamiliar topic
         query = """
             SELECT id, topic, category, text, source_url, source_domain,
-                   quality_score, engagement_score, created_at, chroma_id
+                   quality_score, engagement_score, created_at, chroma_id,
+                   created_at_epoch
             FROM insights
             WHERE quality_score >= 7
               AND is_archived = 0
+              AND NOT EXISTS (
+                  SELECT 1 FROM user_engagement ue
+                  WHERE ue.insight_id = insights.id
+                    AND ue.user_id = ?
+                    AND ue.action = 'view'
+              )
         """
-        params: List[str] = []
+        params: List[str] = [user_id]
 
         if user_topics:
             query += f" AND topic NOT IN ({topic_placeholders})"
@@ -240,6 +257,7 @@ class FeedBuilder:
                     "engagement_score": row[7],
                     "created_at": row[8],
                     "chroma_id": row[9],
+                    "created_ts": row[10],
                 }
         except Exception as e:
             conn.close()
@@ -10,27 +10,55 @@ This service handles:
 
 import sqlite3
 import json
+import calendar
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Set
-import uuid
+from collections import OrderedDict
+from typing import List, Dict, Optional, Set, Tuple
 import os
+import time
+
+import numpy as np
+
+from backend.utils.database import get_pooled_connection, release_connection
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 DB_PATH = os.path.join(PROJECT_ROOT, "insights.db")
 
 
+def _now_iso() -> str:
+    """Current local timestamp in ISO format (bind once per request)"""
+    return datetime.now().isoformat()
+
+
+def _now_ts() -> int:
+    """
+    Current local time as epoch seconds, comparable with
+    insights.created_at_epoch (strftime('%s', created_at) of the naive local
+    ISO timestamps we store)
+    """
+    return calendar.timegm(datetime.now().timetuple())
+
+
 class FeedService:
     """Main feed generation service"""
 
+    # Column order for bulk feed reads (rows fetched as plain tuples)
+    FOLLOWING_COLUMNS = (
+        'id', 'topic', 'category', 'text', 'source_url', 'source_domain',
+        'quality_score', 'engagement_score', 'created_at', 'score'
+    )
+    CANDIDATE_COLUMNS = (
+        'id', 'topic', 'category', 'text', 'source_url', 'source_domain',
+        'quality_score', 'engagement_score', 'created_at', 'chroma_id', 'created_ts'
+    )
+
     def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
         self.scorer = InsightScorer(db_path)
 
     def get_db_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled database connection (release, don't close)"""
+        return get_pooled_connection(self.db_path)
 
     def generate_following_feed(
         self,
@@ -61,12 +89,38 @@ class FeedService:
         topics = [row['topic'] for row in cursor.fetchall()]
 
         if not topics:
-            conn.close()
+            release_connection(conn)
             return []
 
         # SQL-level scoring and pagination
         placeholders = ','.join('?' * len(topics))
 
+        # Fresh users have nothing to exclude; otherwise probe per insight
+        # with NOT EXISTS so SQLite can do indexed point lookups instead of
+        # joining and grouping every engagement row
+        cursor.execute("""
+            SELECT 1 FROM user_engagement
+            WHERE user_id = ? AND action = 'view'
+            LIMIT 1
+        """, (user_id,))
+        has_viewed = cursor.fetchone() is not None
+
+        # Fetched once per request for the diversity penalty below
+        last_topic = self.scorer._get_last_shown_topic(user_id, cursor) if has_viewed else None
+
+        if has_viewed:
+            exclusion_clause = """
+            AND NOT EXISTS (
+                SELECT 1 FROM user_engagement ue
+                WHERE ue.insight_id = i.id
+                  AND ue.user_id = ?
+                  AND ue.action = 'view'
+            )  -- Exclude seen insights"""
+            params = [last_topic] + topics + [user_id, limit, offset]
+        else:
+            exclusion_clause = ""
+            params = [last_topic] + topics + [limit, offset]
+
         # Calculate days_old in SQL for freshness score
         query = f"""
         WITH scored_insights AS (
@@ -78,34 +132,35 @@ class FeedService:
                     (i.quality_score / 10.0 * 0.20) +  -- Base quality (20%)
                     (i.engagement_score * 0.15) +      -- Social proof (15%)
                     (1.0) +                              -- Topic match boost (100%)
-                    (MAX(0, 1.0 - (julianday('now') - julianday(i.created_at)) / 30.0) * 0.20)  -- Freshness (20%)
+                    (MAX(0, 1.0 - (CAST(strftime('%s', 'now') AS INTEGER) - i.created_at_epoch) / 86400.0 / 30.0) * 0.20) -  -- Freshness (20%)
+                    (CASE WHEN i.topic = ? THEN 0.30 ELSE 0 END)  -- Same topic as last shown
                 ) as score
             FROM insights i
-            LEFT JOIN user_engagement ue ON
-                i.id = ue.insight_id AND
-                ue.user_id = ? AND
-                ue.action = 'view'
             WHERE i.topic IN ({placeholders})
-            AND i.is_archived = 0
-            AND ue.insight_id IS NULL  -- Exclude seen insights
-            GROUP BY i.id
+            AND i.is_archived = 0{exclusion_clause}
             ORDER BY score DESC
             LIMIT ? OFFSET ?
         )
         SELECT * FROM scored_insights
         """
 
-        params = [user_id] + topics + [limit, offset]
+        # Plain tuples avoid per-row sqlite3.Row bookkeeping on bulk reads
+        cursor.row_factory = None
         cursor.execute(query, params)
 
-        results = [dict(row) for row in cursor.fetchall()]
+        results = [dict(zip(self.FOLLOWING_COLUMNS, row)) for row in cursor.fetchall()]
 
-        # Mark as viewed
+        # Mark the whole page as viewed in one set-based INSERT
         if results:
-            self._mark_viewed(user_id, [r['id'] for r in results], cursor)
-            conn.commit()
+            insight_ids = json.dumps([r['id'] for r in results])
+            with conn:
+                cursor.execute("""
+                    INSERT OR IGNORE INTO user_engagement (user_id, insight_id, action, created_at)
+                    SELECT ?, value, 'view', ?
+                    FROM json_each(?)
+                """, (user_id, _now_iso(), insight_ids))
 
-        conn.close()
+        release_connection(conn)
         return results
 
     def generate_for_you_feed(
@@ -138,59 +193,68 @@ class FeedService:
         # This is larger than requested to allow diversity filtering
         candidate_pool_size = min(200, (limit + 1) * 4)
 
-        # Get viewed insights to exclude
-        cursor.execute("""
-            SELECT DISTINCT insight_id
-            FROM user_engagement
-            WHERE user_id = ? AND action = 'view'
-        """, (user_id,))
-        viewed_ids = [row['insight_id'] for row in cursor.fetchall()]
-
-        # Build exclusion list for SQL
-        if viewed_ids:
-            placeholders = ','.join('?' * len(viewed_ids))
-            exclusion_clause = f"AND i.id NOT IN ({placeholders})"
-            params = viewed_ids + [candidate_pool_size]
-        else:
-            exclusion_clause = ""
-            params = [candidate_pool_size]
-
-        # Fetch candidate pool with basic quality filtering
-        query = f"""
+        # Fetch candidate pool from the materialized feed view, walking its
+        # base-score index top-down; viewed insights are excluded in SQL
+        # (index-only probe per candidate)
+        query = """
             SELECT
                 i.id, i.topic, i.category, i.text, i.source_url, i.source_domain,
-                i.quality_score, i.engagement_score, i.created_at, i.chroma_id
-            FROM insights i
-            WHERE i.is_archived = 0
-              AND i.quality_score >= 5
-              {exclusion_clause}
-            ORDER BY i.quality_score DESC, i.created_at DESC
+                i.quality_score, i.engagement_score, i.created_at, i.chroma_id,
+                i.created_at_epoch AS created_ts
+            FROM insight_feed_mv mv
+            JOIN insights i ON i.id = mv.id
+            WHERE mv.quality_score >= 5
+              AND NOT EXISTS (
+                  SELECT 1 FROM user_engagement ue
+                  WHERE ue.user_id = ?
+                    AND ue.action = 'view'
+                    AND ue.insight_id = mv.id
+              )
+            ORDER BY (mv.quality_score / 10.0 * 0.20 + mv.engagement_score * 0.15 + mv.freshness_cached * 0.20) DESC
             LIMIT ?
         """
 
-        cursor.execute(query, params)
-        candidates = [dict(row) for row in cursor.fetchall()]
+        cursor.row_factory = None
+        cursor.execute(query, (user_id, candidate_pool_size))
+        candidates = [dict(zip(self.CANDIDATE_COLUMNS, row)) for row in cursor.fetchall()]
 
-        conn.close()
+        release_connection(conn)
 
         if not candidates:
             return ([], False) if check_has_more else []
 
-        # Check if more insights exist by looking at candidate pool
-        # If we got the full pool, there are likely more beyond it
-        has_more = len(candidates) >= candidate_pool_size
-
         # Use FeedBuilder for personalized scoring and diversity
         builder = FeedBuilder(self.db_path)
         feed = builder.build_feed(user_id, candidates, length=limit)
 
-        # Mark as viewed
-        if feed:
+        has_more = False
+        if feed or check_has_more:
             conn = self.get_db_connection()
             cursor = conn.cursor()
-            self._mark_viewed(user_id, [insight['id'] for insight in feed], cursor)
-            conn.commit()
-            conn.close()
+
+            # Mark as viewed
+            if feed:
+                with conn:
+                    self._mark_viewed(user_id, [insight['id'] for insight in feed], cursor, _now_iso())
+
+            # Ask SQL whether any eligible unseen insight is left after this page
+            if check_has_more:
+                cursor.execute("""
+                    SELECT EXISTS (
+                        SELECT 1 FROM insights i
+                        WHERE i.is_archived = 0
+                          AND i.quality_score >= 5
+                          AND NOT EXISTS (
+                              SELECT 1 FROM user_engagement ue
+                              WHERE ue.insight_id = i.id
+                                AND ue.user_id = ?
+                                AND ue.action = 'view'
+                          )
+                    )
+                """, (user_id,))
+                has_more = bool(cursor.fetchone()[0])
+
+            release_connection(conn)
 
         return (feed, has_more) if check_has_more else feed
 
@@ -210,129 +274,144 @@ class FeedService:
         """
         from backend.services.user_profile_service import UserProfileService
 
+        now = _now_iso()
         conn = self.get_db_connection()
         cursor = conn.cursor()
 
-        # Get insight topic for affinity updates
-        cursor.execute("""
-            SELECT topic FROM insights WHERE id = ?
-        """, (insight_id,))
-        row = cursor.fetchone()
-        topic = row['topic'] if row else None
-
-        # Track whether action is being added or removed
-        affinity_delta = 0.0
-        action_applied = False
-
-        # For like/save actions, check if already exists and toggle
-        if action in ['like', 'save']:
+        # Single commit for the whole engagement action (rolled back if any
+        # step raises)
+        with conn:
+            # Get insight topic for affinity updates
             cursor.execute("""
-                SELECT id FROM user_engagement
-                WHERE user_id = ? AND insight_id = ? AND action = ?
-            """, (user_id, insight_id, action))
-            existing = cursor.fetchone()
+                SELECT topic FROM insights WHERE id = ?
+            """, (insight_id,))
+            row = cursor.fetchone()
+            topic = row['topic'] if row else None
+
+            # Track whether action is being added or removed
+            affinity_delta = 0.0
+            action_applied = False
 
-            if existing:
-                # Already exists, remove it (toggle off)
+            # For like/save actions, check if already exists and toggle
+            if action in ['like', 'save']:
                 cursor.execute("""
-                    DELETE FROM user_engagement
+                    SELECT id FROM user_engagement
                     WHERE user_id = ? AND insight_id = ? AND action = ?
                 """, (user_id, insight_id, action))
-                action_applied = False
-                # Negative delta when removing
-                affinity_delta = -0.15 if action == 'like' else -0.12
+                existing = cursor.fetchone()
+
+                if existing:
+                    # Already exists, remove it (toggle off)
+                    cursor.execute("""
+                        DELETE FROM user_engagement
+                        WHERE user_id = ? AND insight_id = ? AND action = ?
+                    """, (user_id, insight_id, action))
+                    action_applied = False
+                    # Negative delta when removing
+                    affinity_delta = -0.15 if action == 'like' else -0.12
+                else:
+                    # Doesn't exist, add it (toggle on)
+                    cursor.execute("""
+                        INSERT INTO user_engagement (user_id, insight_id, action, created_at)
+                        VALUES (?, ?, ?, ?)
+                    """, (user_id, insight_id, action, now))
+                    action_applied = True
+                    # Positive delta when adding
+                    affinity_delta = 0.15 if action == 'like' else 0.12
             else:
-                # Doesn't exist, add it (toggle on)
-                engagement_id = str(uuid.uuid4())
+                # For view/dismiss, just insert
                 cursor.execute("""
-                    INSERT INTO user_engagement (id, user_id, insight_id, action, created_at)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (engagement_id, user_id, insight_id, action, datetime.now().isoformat()))
+                    INSERT OR IGNORE INTO user_engagement (user_id, insight_id, action, created_at)
+                    VALUES (?, ?, ?, ?)
+                """, (user_id, insight_id, action, now))
                 action_applied = True
-                # Positive delta when adding
-                affinity_delta = 0.15 if action == 'like' else 0.12
-        else:
-            # For view/dismiss, just insert
-            engagement_id = str(uuid.uuid4())
-            cursor.execute("""
-                INSERT OR IGNORE INTO user_engagement (id, user_id, insight_id, action, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (engagement_id, user_id, insight_id, action, datetime.now().isoformat()))
-            action_applied = True
-            # Small negative for dismiss, no change for view
-            affinity_delta = -0.10 if action == 'dismiss' else 0.0
-
-        conn.commit()
-
-        # Update insight engagement score
-        self._update_insight_engagement_score(insight_id, cursor)
-        conn.commit()
-
-        # Update user profile counts
-        profile_service = UserProfileService(self.db_path)
-        if action == 'view':
-            profile_service.increment_view_count(user_id)
-        elif action == 'like' and action_applied:
-            profile_service.increment_like_count(user_id)
-        elif action == 'save' and action_applied:
-            profile_service.increment_save_count(user_id)
-
-        # Update topic affinity if we have a topic and delta
-        if topic and affinity_delta != 0.0:
-            profile_service.update_topic_affinity(user_id, topic, affinity_delta)
-
-        conn.close()
+                # Small negative for dismiss, no change for view
+                affinity_delta = -0.10 if action == 'dismiss' else 0.0
 
-    def follow_topic(self, user_id: str, topic: str):
-        """Add topic to user's following list and create affinity"""
-        from backend.services.user_profile_service import UserProfileService
+            # insights.engagement_score is maintained by the user_engagement
+            # counter triggers (migration 009)
 
+            # Update user profile counts and topic affinity (same transaction via
+            # shared cursor); like/save only count when toggled on
+            counted_action = action if action == 'view' or action_applied else None
+            UserProfileService(self.db_path).record_engagement(
+                user_id, counted_action, topic, affinity_delta, cursor, now
+            )
+
+        release_connection(conn)
+
+    def refresh_feed_mv(self) -> int:
+        """
+        Recompute freshness_cached in insight_feed_mv
+
+        Triggers keep the view in sync on writes, but freshness decays with
+        time alone, so this should run periodically.
+
+        Returns:
+            Number of rows refreshed
+        """
         conn = self.get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            INSERT OR IGNORE INTO user_topics (user_id, topic, followed_at)
-            VALUES (?, ?, ?)
-        """, (user_id, topic, datetime.now().isoformat()))
+        with conn:
+            cursor.execute("""
+                UPDATE insight_feed_mv
+                SET freshness_cached = MAX(0, 1.0 - (julianday('now') - julianday(created_at)) / 30.0)
+            """)
+            refreshed = cursor.rowcount
 
-        conn.commit()
-        conn.close()
+        release_connection(conn)
+        return refreshed
 
-        # Create or boost topic affinity (0.70 for followed topics)
-        profile_service = UserProfileService(self.db_path)
+    def follow_topic(self, user_id: str, topic: str):
+        """Add topic to user's following list and create affinity"""
+        from backend.services.user_profile_service import UserProfileService
+
+        now = _now_iso()
         conn = self.get_db_connection()
         cursor = conn.cursor()
 
-        # Check if affinity exists
-        cursor.execute("""
-            SELECT affinity_score FROM user_topic_affinities
-            WHERE user_id = ? AND topic = ?
-        """, (user_id, topic))
-        row = cursor.fetchone()
+        # Follow and affinity in one transaction; the profile service writes
+        # through our cursor instead of checking the connection out again
+        with conn:
+            cursor.execute("""
+                INSERT OR IGNORE INTO user_topics (user_id, topic, followed_at)
+                VALUES (?, ?, ?)
+            """, (user_id, topic, now))
 
-        if row:
-            # Update existing affinity to at least 0.70
-            current = row['affinity_score']
-            if current < 0.70:
-                delta = 0.70 - current
-                profile_service.update_topic_affinity(user_id, topic, delta)
-        else:
-            # Create new affinity at 0.70
-            profile_service.update_topic_affinity(user_id, topic, 0.20)  # +0.20 from default 0.5 = 0.70
+            # Create or boost topic affinity (0.70 for followed topics)
+            profile_service = UserProfileService(self.db_path)
 
-        conn.close()
+            # Check if affinity exists
+            cursor.execute("""
+                SELECT affinity_score FROM user_topic_affinities
+                WHERE user_id = ? AND topic = ?
+            """, (user_id, topic))
+            row = cursor.fetchone()
+
+            if row:
+                # Update existing affinity to at least 0.70
+                current = row['affinity_score']
+                if current < 0.70:
+                    delta = 0.70 - current
+                    profile_service.update_topic_affinity(user_id, topic, delta, cursor, now)
+            else:
+                # Create new affinity at 0.70
+                profile_service.update_topic_affinity(user_id, topic, 0.20, cursor, now)  # +0.20 from default 0.5 = 0.70
+
+        release_connection(conn)
 
     def unfollow_topic(self, user_id: str, topic: str):
         """Remove topic from user's following list"""
         conn = self.get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            DELETE FROM user_topics WHERE user_id = ? AND topic = ?
-        """, (user_id, topic))
+        with conn:
+            cursor.execute("""
+                DELETE FROM user_topics WHERE user_id = ? AND topic = ?
+            """, (user_id, topic))
 
-        conn.commit()
-        conn.close()
+        release_connection(conn)
 
     def get_user_topics(self, user_id: str) -> List[str]:
         """Get list of topics user is following"""
@@ -344,7 +423,7 @@ class FeedService:
         """, (user_id,))
 
         topics = [row['topic'] for row in cursor.fetchall()]
-        conn.close()
+        release_connection(conn)
 
         return topics
 
@@ -366,7 +445,7 @@ class FeedService:
         """, (user_id, limit, offset))
 
         insights = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        release_connection(conn)
 
         return insights
 
@@ -388,71 +467,108 @@ class FeedService:
         """, (user_id, limit, offset))
 
         insights = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        release_connection(conn)
 
         return insights
 
-    def _get_seen_insight_ids(self, user_id: str, cursor) -> Set[str]:
-        """Get set of insight IDs user has already seen"""
-        cursor.execute("""
-            SELECT DISTINCT insight_id
-            FROM user_engagement
-            WHERE user_id = ? AND action = 'view'
-        """, (user_id,))
-
-        return {row['insight_id'] for row in cursor.fetchall()}
-
-    def _mark_viewed(self, user_id: str, insight_ids: List[str], cursor):
-        """Mark insights as viewed by user"""
-        for insight_id in insight_ids:
-            engagement_id = str(uuid.uuid4())
-            cursor.execute("""
-                INSERT OR IGNORE INTO user_engagement (id, user_id, insight_id, action, created_at)
-                VALUES (?, ?, ?, 'view', ?)
-            """, (engagement_id, user_id, insight_id, datetime.now().isoformat()))
-
-    def _update_insight_engagement_score(self, insight_id: str, cursor):
-        """Recalculate engagement score for an insight"""
-        cursor.execute("""
-            SELECT
-                COUNT(DISTINCT CASE WHEN action = 'view' THEN user_id END) as views,
-                COUNT(DISTINCT CASE WHEN action = 'like' THEN user_id END) as likes,
-                COUNT(DISTINCT CASE WHEN action = 'save' THEN user_id END) as saves
-            FROM user_engagement
-            WHERE insight_id = ?
-        """, (insight_id,))
+    def _mark_viewed(self, user_id: str, insight_ids: List[str], cursor, now: Optional[str] = None):
+        """
+        Mark insights as viewed by user
 
-        row = cursor.fetchone()
-        views = row['views']
-        likes = row['likes']
-        saves = row['saves']
+        Inserts all rows with one executemany inside a single write
+        transaction; the caller commits.
+        """
+        if not insight_ids:
+            return
+        if now is None:
+            now = _now_iso()
 
-        # Calculate engagement score: (likes + saves) / views
-        if views > 0:
-            engagement_score = min((likes + saves) / views, 1.0)
-        else:
-            engagement_score = 0.0
+        # Take the write lock up front rather than upgrading mid-batch
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
 
-        # Update insight
-        cursor.execute("""
-            UPDATE insights
-            SET engagement_score = ?, updated_at = ?
-            WHERE id = ?
-        """, (engagement_score, datetime.now().isoformat(), insight_id))
+        rows = [(user_id, insight_id, now) for insight_id in insight_ids]
+        cursor.executemany("""
+            INSERT OR IGNORE INTO user_engagement (user_id, insight_id, action, created_at)
+            VALUES (?, ?, 'view', ?)
+        """, rows)
 
 
 class InsightScorer:
     """Calculates personalized scores for insights"""
 
+    # Word-overlap fallback: each distinct word gets a bit, each topic a mask.
+    # Both are dropped together once TOPIC_MASK_CACHE_SIZE topics are cached,
+    # which bounds memory and keeps masks from widening forever.
+    _token_bits: Dict[str, int] = {}
+    _topic_masks: Dict[str, int] = {}
+    TOPIC_MASK_CACHE_SIZE = 4096
+    SIM_MEMO_SIZE = 8192
+    PREFS_CACHE_SIZE = 4096
+    PREFS_TTL_SECONDS = 60
+
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # Database-backed caches live on the scorer, so they never outlive
+        # it (FeedService builds one per service instance) or mix databases.
+        # topic_similarity as a dense symmetric matrix indexed via
+        # _topic_idx (NaN = no row), loaded on first use by _similarity()
+        self._topic_idx: Dict[str, int] = {}
+        self._sim: Optional[np.ndarray] = None
+        # LRU memo of computed similarities keyed by sorted topic pair
+        self._sim_memo: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        # LRU of user_id -> (updated_at, parsed preferences, cached_at monotonic)
+        self._prefs_cache: "OrderedDict[str, Tuple[Optional[str], Dict, float]]" = OrderedDict()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Pooled connection for scoring calls made without a cursor"""
+        return get_pooled_connection(self.db_path)
+
+    @staticmethod
+    def _load_topic_similarity(db_path: str) -> Tuple[Dict[str, int], np.ndarray]:
+        """
+        Load the precomputed topic_similarity table into a dense symmetric
+        matrix plus a {topic: row index} map.
+        Pairs without a row are NaN; returns an empty matrix if the table
+        doesn't exist or is empty.
+        """
+        try:
+            conn = sqlite3.connect(db_path)
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT topic_a, topic_b, similarity_score FROM topic_similarity
+            """)
+            rows = cursor.fetchall()
+            conn.close()
+        except Exception:
+            rows = []
+
+        topic_idx: Dict[str, int] = {}
+        for topic_a, topic_b, _ in rows:
+            topic_idx.setdefault(topic_a, len(topic_idx))
+            topic_idx.setdefault(topic_b, len(topic_idx))
+
+        sim = np.full((len(topic_idx), len(topic_idx)), np.nan, dtype=np.float32)
+        np.fill_diagonal(sim, 1.0)
+        for topic_a, topic_b, score in rows:
+            i, j = topic_idx[topic_a], topic_idx[topic_b]
+            sim[i, j] = sim[j, i] = score
+
+        return topic_idx, sim
+
+    def _similarity(self) -> Tuple[Dict[str, int], np.ndarray]:
+        """This scorer's topic_similarity matrix, loaded on first use"""
+        if self._sim is None:
+            self._topic_idx, self._sim = self._load_topic_similarity(self.db_path)
+        return self._topic_idx, self._sim
 
     def calculate_feed_score(
         self,
         user_id: str,
         insight: Dict,
         feed_type: str = 'following',
-        cursor = None
+        cursor = None,
+        last_topic: Optional[str] = None
     ) -> float:
         """
         Calculate personalized score for an insight
@@ -462,22 +578,34 @@ class InsightScorer:
             insight: Insight dictionary
             feed_type: 'following' or 'for_you'
             cursor: Optional database cursor
+            last_topic: Topic of the last insight shown to the user. Callers
+                scoring many candidates should fetch it once and pass it in;
+                when omitted it is looked up per call.
 
         Returns:
             Score (0-10+)
         """
-        score = 0.0
-
-        close_conn = False
         if cursor is None:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            close_conn = True
+            cursor = self._connect().cursor()
 
         # Get user preferences
         prefs = self._get_user_preferences(user_id, cursor)
         user_topics = self._get_user_topics(user_id, cursor)
+        if last_topic is None:
+            last_topic = self._get_last_shown_topic(user_id, cursor)
+
+        return self._score_with_context(insight, prefs, set(user_topics), last_topic, _now_ts())
+
+    def _score_with_context(
+        self,
+        insight: Dict,
+        prefs: Dict,
+        user_topics: Set[str],
+        last_topic: Optional[str],
+        now_ts: int
+    ) -> float:
+        """Score one insight from pre-fetched per-user context (no SQL)"""
+        score = 0.0
 
         # 1. Base Quality (20%)
         score += (insight['quality_score'] / 10) * 0.20
@@ -509,25 +637,78 @@ class InsightScorer:
         score += insight.get('engagement_score', 0) * 0.15
 
         # 6. Freshness (20%)
-        days_old = self._days_since_created(insight['created_at'])
+        created_ts = insight.get('created_ts')
+        if created_ts is not None:
+            days_old = (now_ts - created_ts) // 86400
+        else:
+            days_old = self._days_since_created(insight['created_at'])
         freshness = max(0, 1 - (days_old / 30))
         score += freshness * 0.20
 
         # 7. Diversity Penalty (avoid same topic back-to-back)
-        last_topic = self._get_last_shown_topic(user_id, cursor)
         if insight['topic'] == last_topic:
             score -= 0.30
 
-        if close_conn:
-            cursor.connection.close()
-
         return max(0, score)
 
+    def _score_batch(
+        self,
+        user_id: str,
+        insights: List[Dict],
+        feed_type: str = 'following',
+        cursor=None
+    ) -> List[float]:
+        """
+        Score many insights for one user
+
+        Preferences, followed topics and the last shown topic are fetched
+        once for the whole batch instead of once per insight. For the
+        'for_you' feed the discovery factors from predict_engagement are
+        added (topic similarity and trending bonus), also computed in bulk.
+
+        Returns:
+            Scores in the same order as insights
+        """
+        if not insights:
+            return []
+
+        if cursor is None:
+            cursor = self._connect().cursor()
+
+        prefs = self._get_user_preferences(user_id, cursor)
+        user_topics = self._get_user_topics(user_id, cursor)
+        last_topic = self._get_last_shown_topic(user_id, cursor)
+        followed = set(user_topics)
+        now_ts = _now_ts()
+
+        scores = [
+            self._score_with_context(insight, prefs, followed, last_topic, now_ts)
+            for insight in insights
+        ]
+
+        if feed_type == 'for_you':
+            max_sim = self._max_topic_similarity(
+                [insight['topic'] for insight in insights],
+                user_topics
+            )
+            recent = self._get_recent_engagement_counts(
+                [insight['id'] for insight in insights],
+                cursor,
+                days=7
+            )
+            scores = [
+                score + float(sim) * 0.25 + (0.2 if recent.get(insight['id'], 0) > 5 else 0.0)
+                for score, sim, insight in zip(scores, max_sim, insights)
+            ]
+
+        return scores
+
     def predict_engagement(
         self,
         user_id: str,
         insight: Dict,
-        cursor = None
+        cursor = None,
+        last_topic: Optional[str] = None
     ) -> float:
         """
         Predict likelihood of user engaging with insight (For You feed)
@@ -536,64 +717,99 @@ class InsightScorer:
             user_id: User identifier
             insight: Insight dictionary
             cursor: Optional database cursor
+            last_topic: Optional pre-fetched last shown topic
 
         Returns:
             Predicted engagement score
         """
-        # Start with base score
-        base_score = self.calculate_feed_score(user_id, insight, 'for_you', cursor)
-
-        close_conn = False
         if cursor is None:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            close_conn = True
+            cursor = self._connect().cursor()
+
+        # Followed topics are fetched once and shared by both score parts
+        prefs = self._get_user_preferences(user_id, cursor)
+        user_topics = self._get_user_topics(user_id, cursor)
+        if last_topic is None:
+            last_topic = self._get_last_shown_topic(user_id, cursor)
+
+        # Start with base score
+        base_score = self._score_with_context(insight, prefs, set(user_topics), last_topic, _now_ts())
 
         # Additional discovery factors
 
-        # 1. Topic Similarity to followed topics
-        user_topics = self._get_user_topics(user_id, cursor)
-        max_similarity = 0.0
-        for followed_topic in user_topics:
-            sim = self._calculate_topic_similarity(insight['topic'], followed_topic, cursor)
-            max_similarity = max(max_similarity, sim)
-        base_score += max_similarity * 0.25
+        # 1. Topic Similarity to followed topics (precomputed matrix gather)
+        max_similarity = self._max_topic_similarity([insight['topic']], user_topics)[0]
+        base_score += float(max_similarity) * 0.25
 
         # 2. Trending Bonus (recently popular insights)
         recent_engagement = self._get_recent_engagement_count(insight['id'], cursor, days=7)
         if recent_engagement > 5:
             base_score += 0.2
 
-        if close_conn:
-            cursor.connection.close()
-
         return max(0, base_score)
 
     def _get_user_preferences(self, user_id: str, cursor) -> Dict:
-        """Get user preferences (or create default)"""
+        """
+        Get user preferences (or create default)
+
+        Parsed JSON is cached per user on this scorer. Within
+        PREFS_TTL_SECONDS the cached value is returned without touching the
+        database; after that a single-column updated_at probe decides
+        whether to re-parse. Nothing in the app writes user_preferences
+        yet, so there is no write-side invalidation: a changed row is
+        picked up once the TTL lapses.
+        """
+        cache_key = user_id
+        cached = self._prefs_cache.get(cache_key)
+        now = time.monotonic()
+        if cached is not None and now - cached[2] < self.PREFS_TTL_SECONDS:
+            self._prefs_cache.move_to_end(cache_key)
+            return cached[1]
+
         cursor.execute("""
-            SELECT liked_categories, saved_sources, topic_affinity
-            FROM user_preferences
-            WHERE user_id = ?
+            SELECT updated_at FROM user_preferences WHERE user_id = ?
         """, (user_id,))
-
         row = cursor.fetchone()
 
-        if row:
-            return {
-                'liked_categories': json.loads(row['liked_categories'] or '{}'),
-                'saved_sources': json.loads(row['saved_sources'] or '{}'),
-                'topic_affinity': json.loads(row['topic_affinity'] or '{}')
-            }
-        else:
+        if not row:
             # Return defaults
             return {
                 'liked_categories': {},
                 'saved_sources': {},
-                'topic_affinity': {}
+                'topic_affinity': {},
+                '_max_likes': 1,
+                '_max_saves': 1
             }
 
+        if cached is not None and cached[0] == row['updated_at']:
+            self._cache_preferences(cache_key, (cached[0], cached[1], now))
+            return cached[1]
+
+        cursor.execute("""
+            SELECT liked_categories, saved_sources, topic_affinity, updated_at
+            FROM user_preferences
+            WHERE user_id = ?
+        """, (user_id,))
+        row = cursor.fetchone()
+
+        prefs = {
+            'liked_categories': json.loads(row['liked_categories'] or '{}'),
+            'saved_sources': json.loads(row['saved_sources'] or '{}'),
+            'topic_affinity': json.loads(row['topic_affinity'] or '{}')
+        }
+        # Normalizers for the category/source weights, computed once per parse
+        prefs['_max_likes'] = max(prefs['liked_categories'].values(), default=1)
+        prefs['_max_saves'] = max(prefs['saved_sources'].values(), default=1)
+        self._cache_preferences(cache_key, (row['updated_at'], prefs, now))
+        return prefs
+
+    def _cache_preferences(self, cache_key: str, entry: Tuple[Optional[str], Dict, float]):
+        """Store parsed preferences, evicting the least recently used user"""
+        cache = self._prefs_cache
+        cache[cache_key] = entry
+        cache.move_to_end(cache_key)
+        if len(cache) > self.PREFS_CACHE_SIZE:
+            cache.popitem(last=False)
+
     def _get_user_topics(self, user_id: str, cursor) -> List[str]:
         """Get topics user is following"""
         cursor.execute("""
@@ -609,7 +825,7 @@ class InsightScorer:
 
         liked_categories = prefs['liked_categories']
         category_likes = liked_categories.get(category, 0)
-        max_likes = max(liked_categories.values()) if liked_categories else 1
+        max_likes = prefs['_max_likes']
 
         return category_likes / max_likes if max_likes > 0 else 0.5
 
@@ -620,7 +836,7 @@ class InsightScorer:
 
         saved_sources = prefs['saved_sources']
         source_saves = saved_sources.get(source_domain, 0)
-        max_saves = max(saved_sources.values()) if saved_sources else 1
+        max_saves = prefs['_max_saves']
 
         return source_saves / max_saves if max_saves > 0 else 0.5
 
@@ -647,33 +863,87 @@ class InsightScorer:
         row = cursor.fetchone()
         return row['topic'] if row else None
 
-    def _calculate_topic_similarity(self, topic_a: str, topic_b: str, cursor) -> float:
+    def _calculate_topic_similarity(self, topic_a: str, topic_b: str) -> float:
         """Calculate similarity between two topics (0-1)"""
         if topic_a == topic_b:
             return 1.0
 
-        # Check if we have precomputed similarity
-        cursor.execute("""
-            SELECT similarity_score
-            FROM topic_similarity
-            WHERE (topic_a = ? AND topic_b = ?) OR (topic_a = ? AND topic_b = ?)
-        """, (topic_a, topic_b, topic_b, topic_a))
-
-        row = cursor.fetchone()
-        if row:
-            return row['similarity_score']
+        key = (topic_a, topic_b) if topic_a < topic_b else (topic_b, topic_a)
+        memo = self._sim_memo
+        score = memo.get(key)
+        if score is not None:
+            memo.move_to_end(key)
+            return score
 
-        # Simple heuristic: word overlap (will improve later)
-        words_a = set(topic_a.lower().split())
-        words_b = set(topic_b.lower().split())
+        # Check if we have precomputed similarity
+        score = None
+        topic_idx, sim = self._similarity()
+        i, j = topic_idx.get(topic_a), topic_idx.get(topic_b)
+        if i is not None and j is not None and not np.isnan(sim[i, j]):
+            score = float(sim[i, j])
+        if score is None:
+            # Simple heuristic: word overlap (Jaccard over word bitmasks).
+            # Bits only compare within one generation, so reset before
+            # building either mask, never between them.
+            if len(self._topic_masks) >= self.TOPIC_MASK_CACHE_SIZE:
+                self._topic_masks.clear()
+                self._token_bits.clear()
+            mask_a = self._get_topic_mask(topic_a)
+            mask_b = self._get_topic_mask(topic_b)
+
+            if not mask_a or not mask_b:
+                score = 0.0
+            else:
+                score = (mask_a & mask_b).bit_count() / (mask_a | mask_b).bit_count()
 
-        if not words_a or not words_b:
-            return 0.0
+        memo[key] = score
+        if len(memo) > self.SIM_MEMO_SIZE:
+            memo.popitem(last=False)
+        return score
 
-        overlap = len(words_a & words_b)
-        total = len(words_a | words_b)
+    def _max_topic_similarity(
+        self,
+        candidate_topics: List[str],
+        followed_topics: List[str]
+    ) -> np.ndarray:
+        """
+        Max similarity of each candidate topic to any followed topic
 
-        return overlap / total if total > 0 else 0.0
+        Gathers a (candidates x followed) block from the precomputed matrix
+        and reduces it row-wise, so one call covers a whole batch of
+        candidates. Pairs missing from the table fall back to
+        _calculate_topic_similarity.
+        """
+        if not followed_topics:
+            return np.zeros(len(candidate_topics), dtype=np.float32)
+
+        topic_idx, sim = self._similarity()
+        c_idx = np.array([topic_idx.get(t, -1) for t in candidate_topics])
+        f_idx = np.array([topic_idx.get(t, -1) for t in followed_topics])
+
+        sim_matrix = np.full((len(candidate_topics), len(followed_topics)), np.nan, dtype=np.float32)
+        c_known, f_known = c_idx >= 0, f_idx >= 0
+        if c_known.any() and f_known.any():
+            sim_matrix[np.ix_(c_known, f_known)] = sim[np.ix_(c_idx[c_known], f_idx[f_known])]
+
+        for i, j in zip(*np.nonzero(np.isnan(sim_matrix))):
+            sim_matrix[i, j] = self._calculate_topic_similarity(candidate_topics[i], followed_topics[j])
+
+        return sim_matrix.max(axis=1)
+
+    def _get_topic_mask(self, topic: str) -> int:
+        """Get bitmask of a topic's lowercased words (cached)"""
+        mask = self._topic_masks.get(topic)
+        if mask is None:
+            mask = 0
+            token_bits = self._token_bits
+            for word in topic.lower().split():
+                bit = token_bits.get(word)
+                if bit is None:
+                    bit = token_bits[word] = len(token_bits)
+                mask |= 1 << bit
+            self._topic_masks[topic] = mask
+        return mask
 
     def _get_recent_engagement_count(self, insight_id: str, cursor, days: int = 7) -> int:
         """Count recent engagements (likes/saves) for an insight"""
@@ -689,3 +959,27 @@ class InsightScorer:
 
         row = cursor.fetchone()
         return row[0] if row else 0
+
+    def _get_recent_engagement_counts(
+        self,
+        insight_ids: List[str],
+        cursor,
+        days: int = 7
+    ) -> Dict[str, int]:
+        """Count recent engagements (likes/saves) for many insights at once"""
+        if not insight_ids:
+            return {}
+
+        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        placeholders = ','.join('?' * len(insight_ids))
+
+        cursor.execute(f"""
+            SELECT insight_id, COUNT(*)
+            FROM user_engagement
+            WHERE insight_id IN ({placeholders})
+            AND action IN ('like', 'save')
+            AND created_at >= ?
+            GROUP BY insight_id
+        """, list(insight_ids) + [cutoff_date])
+
+        return {row[0]: row[1] for row in cursor.fetchall()}
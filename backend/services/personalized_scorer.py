@@ -1,7 +1,9 @@
 """Personalized scoring for feed algorithm v2"""
-from typing import Dict
+from typing import Dict, List
 from datetime import datetime
-import random
+import calendar
+
+import numpy as np
 
 
 # Scoring weights (tunable)
@@ -45,70 +47,88 @@ class PersonalizedScorer:
         """
         Calculate composite score for an insight.
 
+        Single-insight form of score_batch.
+
         Returns score in range 0-2+ (higher is better)
         """
-        # 1. Quality fit (0-0.20)
-        quality_fit = self._calculate_quality_fit(
-            insight.get('quality_score', 0),
-            user_profile.quality_preference
-        )
+        return float(self.score_batch(
+            [insight], user_profile, user_affinities, topic_similarities, context
+        )[0])
 
-        # 2. Topic affinity (0-0.30)
-        topic_affinity = self._calculate_topic_affinity(
-            insight.get('topic', ''),
-            user_affinities,
-            topic_similarities or {}
-        )
+    def score_batch(
+        self,
+        insights: List[Dict],
+        user_profile,
+        user_affinities: Dict[str, float],
+        topic_similarities: Dict[str, list] = None,
+        context = None
+    ) -> np.ndarray:
+        """
+        Score many insights at once.
 
-        # 3. Social proof (0-0.20)
-        social_proof = self._calculate_social_proof(
-            insight.get('engagement_score', 0)
-        )
+        Components are computed over N-wide arrays and combined with one
+        dot product against SCORING_WEIGHTS; exploration noise is drawn for
+        all insights in one call.
 
-        # 4. Freshness (0-0.15)
-        freshness = self._calculate_freshness(
-            insight.get('created_at', ''),
-            user_profile.freshness_preference
-        )
+        Returns array of scores (>= 0) aligned with insights
+        """
+        n = len(insights)
+        if n == 0:
+            return np.zeros(0)
 
-        # 5. Exploration (0-0.15 for new users, 0-0.03 for established)
-        exploration = self._calculate_exploration(
-            user_profile.is_new_user()
+        quality = np.fromiter(
+            (insight.get('quality_score', 0) or 0 for insight in insights), dtype=np.float64, count=n
+        )
+        engagement = np.fromiter(
+            (insight.get('engagement_score', 0) or 0 for insight in insights), dtype=np.float64, count=n
         )
 
-        # 6. Diversity penalty (context-based, can be negative)
-        diversity_penalty = 0
-        if context:
-            diversity_penalty = context.get_topic_penalty(insight.get('topic', ''))
-
-        # Composite score
-        score = (
-            quality_fit * SCORING_WEIGHTS["quality_fit"] +
-            topic_affinity * SCORING_WEIGHTS["topic_affinity"] +
-            social_proof * SCORING_WEIGHTS["social_proof"] +
-            freshness * SCORING_WEIGHTS["freshness"] +
-            exploration * SCORING_WEIGHTS["exploration"] +
-            diversity_penalty
+        # 1. Quality fit (1.0 = quality matches preference, 0.0 = mismatch)
+        quality_fit = np.maximum(0, 1.0 - np.abs(quality / 10.0 - user_profile.quality_preference))
+
+        # 2. Topic affinity (dict lookups, once per distinct topic)
+        topic_scores: Dict[str, float] = {}
+        for insight in insights:
+            topic = insight.get('topic', '')
+            if topic not in topic_scores:
+                topic_scores[topic] = self._calculate_topic_affinity(
+                    topic, user_affinities, topic_similarities or {}
+                )
+        topic_affinity = np.fromiter(
+            (topic_scores[insight.get('topic', '')] for insight in insights), dtype=np.float64, count=n
         )
 
-        return max(0, score)  # Ensure non-negative
+        # 3. Social proof (engagement_score is typically 0-10)
+        social_proof = np.minimum(1.0, engagement / 10.0)
 
-    def _calculate_quality_fit(
-        self,
-        insight_quality: float,
-        user_preference: float
-    ) -> float:
-        """
-        Quality fit: 1.0 = perfect match, 0.0 = complete mismatch
+        # 4. Freshness
+        freshness = self._freshness_batch(insights, user_profile.freshness_preference)
 
-        User preference 0.7 → prefers 7/10 content
-        Insight quality 8/10 with preference 0.7 → slight mismatch
+        # 5. Exploration (0-0.15 for new users, 0-0.03 for established)
+        rate = EXPLORATION_RATES["new_user"] if user_profile.is_new_user() else EXPLORATION_RATES["established"]
+        exploration = np.random.random(n) * rate
 
-        Returns 0-1 where 1 = perfect match
-        """
-        normalized_quality = insight_quality / 10.0  # Normalize to 0-1
-        fit = 1.0 - abs(normalized_quality - user_preference)
-        return max(0, fit)
+        # 6. Diversity penalty
+        if context:
+            diversity_penalty = np.fromiter(
+                (context.get_topic_penalty(insight.get('topic', '')) for insight in insights),
+                dtype=np.float64,
+                count=n
+            )
+        else:
+            diversity_penalty = np.zeros(n)
+
+        features = np.column_stack((quality_fit, topic_affinity, social_proof, freshness, exploration))
+        weights = np.array([
+            SCORING_WEIGHTS["quality_fit"],
+            SCORING_WEIGHTS["topic_affinity"],
+            SCORING_WEIGHTS["social_proof"],
+            SCORING_WEIGHTS["freshness"],
+            SCORING_WEIGHTS["exploration"],
+        ])
+        scores = features @ weights + diversity_penalty
+
+        return np.maximum(0, scores)  # Ensure non-negative
 
     def _calculate_topic_affinity(
         self,
@@ -140,20 +160,11 @@ class PersonalizedScorer:
 
         return 0
 
-    def _calculate_social_proof(self, engagement_score: float) -> float:
-        """
-        Social proof from other users' engagement.
-
-        engagement_score is already normalized (likes + saves + shares)
-        Returns 0-1
-        """
-        # engagement_score is typically 0-10, normalize to 0-1
-        return min(1.0, engagement_score / 10.0)
-
     def _calculate_freshness(
         self,
         created_at: str,
-        freshness_preference: float
+        freshness_preference: float,
+        created_ts: int = None
     ) -> float:
         """
         Freshness with personalized decay.
@@ -163,35 +174,45 @@ class PersonalizedScorer:
         - 0.5 = balanced (moderate decay)
         - 0.0 = timeless content (no decay)
 
+        created_ts: epoch seconds selected alongside created_at; when
+        present the ISO string is not parsed.
+
         Returns 0-1
         """
-        try:
-            created_dt = datetime.fromisoformat(created_at)
-            now = datetime.now()
-            age_days = (now - created_dt).days
-
-            # Personalized decay window (days)
-            decay_window = 30 * freshness_preference
+        return float(self._freshness_batch(
+            [{'created_at': created_at, 'created_ts': created_ts}], freshness_preference
+        )[0])
 
-            if decay_window == 0:
-                return 1.0  # No decay for timeless content lovers
-
-            # Linear decay over window
-            freshness = max(0, 1.0 - (age_days / decay_window))
-            return freshness
-
-        except Exception:
-            # If date parsing fails, assume recent
-            return 0.8
-
-    def _calculate_exploration(self, is_new_user: bool) -> float:
+    def _freshness_batch(self, insights: List[Dict], freshness_preference: float) -> np.ndarray:
         """
-        Random exploration boost for discovery.
-
-        New users get more exploration to help them find interests.
-        Established users get less (they already know what they like).
+        Freshness for many insights: ages are collected once, then the
+        personalized linear decay is applied as one array expression.
 
-        Returns 0-0.15 for new users, 0-0.03 for established
+        Returns array of 0-1 values aligned with insights
         """
-        rate = EXPLORATION_RATES["new_user"] if is_new_user else EXPLORATION_RATES["established"]
-        return random.random() * rate
+        n = len(insights)
+        now = datetime.now()
+        now_ts = calendar.timegm(now.timetuple())
+
+        ages = np.zeros(n)
+        parsed = np.ones(n, dtype=bool)
+        for i, insight in enumerate(insights):
+            try:
+                created_ts = insight.get('created_ts')
+                if created_ts is not None:
+                    ages[i] = (now_ts - created_ts) // 86400
+                else:
+                    ages[i] = (now - datetime.fromisoformat(insight.get('created_at', ''))).days
+            except Exception:
+                parsed[i] = False
+
+        # Personalized decay window (days)
+        decay_window = 30 * freshness_preference
+
+        if decay_window == 0:
+            freshness = np.ones(n)  # No decay for timeless content lovers
+        else:
+            freshness = np.maximum(0, 1.0 - ages / decay_window)  # Linear decay over window
+
+        # If date parsing fails, assume recent
+        return np.where(parsed, freshness, 0.8)
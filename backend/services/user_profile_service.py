@@ -1,12 +1,21 @@
 """User Profile Service for personalized feed algorithm"""
-import sqlite3
-from typing import Dict
+import calendar
+import math
+from typing import Dict, Optional
 from datetime import datetime
 import os
 
+import numpy as np
+
+from backend.utils.database import get_pooled_connection, release_connection
+
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 DB_PATH = os.path.join(PROJECT_ROOT, "insights.db")
 
+# Weekly affinity decay, kept as a log so decay is a single exp()
+DECAY_RATE = 0.95
+LOG_DECAY_RATE = math.log(DECAY_RATE)
+
 
 class UserProfile:
     """User profile data class"""
@@ -36,25 +45,76 @@ class UserProfile:
 class UserProfileService:
     """Service for managing user profiles and topic affinities"""
 
+    # SQL is kept as constants so every call passes the identical string and
+    # hits the connection's statement cache instead of being re-prepared
+    _SQL_SELECT_PROFILE = """
+        SELECT user_id, quality_preference, freshness_preference,
+               avg_session_length, total_views, total_likes, total_saves
+        FROM user_profiles
+        WHERE user_id = ?
+    """
+    _SQL_INSERT_PROFILE = """
+        INSERT INTO user_profiles (user_id)
+        VALUES (?)
+    """
+    # Insert at 0.5 + delta or add delta to the existing score, clamped to [0, 1]
+    _SQL_UPSERT_AFFINITY = """
+        INSERT INTO user_topic_affinities
+        (user_id, topic, affinity_score, last_engagement_at, last_engagement_epoch, updated_at)
+        VALUES (
+            :user_id, :topic, MAX(0.0, MIN(1.0, 0.5 + :delta)),
+            :now, CAST(strftime('%s', :now) AS INTEGER), :now
+        )
+        ON CONFLICT(user_id, topic) DO UPDATE SET
+            affinity_score = MAX(0.0, MIN(1.0, affinity_score + :delta)),
+            last_engagement_at = excluded.last_engagement_at,
+            last_engagement_epoch = excluded.last_engagement_epoch,
+            updated_at = excluded.updated_at
+    """
+    _SQL_INC_VIEWS = """
+        UPDATE user_profiles
+        SET total_views = total_views + 1,
+            updated_at = ?
+        WHERE user_id = ?
+    """
+    _SQL_INC_LIKES = """
+        UPDATE user_profiles
+        SET total_likes = total_likes + 1,
+            updated_at = ?
+        WHERE user_id = ?
+    """
+    _SQL_INC_SAVES = """
+        UPDATE user_profiles
+        SET total_saves = total_saves + 1,
+            updated_at = ?
+        WHERE user_id = ?
+    """
+    _SQL_INCREMENT = {
+        'total_views': _SQL_INC_VIEWS,
+        'total_likes': _SQL_INC_LIKES,
+        'total_saves': _SQL_INC_SAVES,
+    }
+    _ACTION_COUNTERS = {
+        'view': 'total_views',
+        'like': 'total_likes',
+        'save': 'total_saves',
+    }
+
     def __init__(self, db_path: str = DB_PATH):
+        # Connections come from the per-thread pool in backend.utils.database
         self.db_path = db_path
 
     def get_or_create_profile(self, user_id: str) -> UserProfile:
         """Get user profile or create if doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT user_id, quality_preference, freshness_preference,
-                   avg_session_length, total_views, total_likes, total_saves
-            FROM user_profiles
-            WHERE user_id = ?
-        """, (user_id,))
+        cursor.execute(self._SQL_SELECT_PROFILE, (user_id,))
 
         row = cursor.fetchone()
 
         if row:
-            conn.close()
+            release_connection(conn)
             return UserProfile(
                 user_id=row[0],
                 quality_preference=row[1],
@@ -66,12 +126,9 @@ class UserProfileService:
             )
 
         # Create new profile with defaults
-        cursor.execute("""
-            INSERT INTO user_profiles (user_id)
-            VALUES (?)
-        """, (user_id,))
-        conn.commit()
-        conn.close()
+        with conn:
+            cursor.execute(self._SQL_INSERT_PROFILE, (user_id,))
+        release_connection(conn)
 
         return UserProfile(user_id=user_id)
 
@@ -85,36 +142,42 @@ class UserProfileService:
 
         Time decay formula: affinity * (0.95 ** weeks_since_last_engagement)
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
+        # Epoch column from migration 013; parse the ISO text only for rows
+        # written before it existed
         cursor.execute("""
-            SELECT topic, affinity_score, last_engagement_at
+            SELECT topic, affinity_score,
+                   COALESCE(last_engagement_epoch, CAST(strftime('%s', last_engagement_at) AS INTEGER))
             FROM user_topic_affinities
             WHERE user_id = ?
         """, (user_id,))
 
-        affinities = {}
-        now = datetime.now()
+        rows = cursor.fetchall()
+        release_connection(conn)
 
-        for row in cursor.fetchall():
-            topic = row[0]
-            base_affinity = row[1]
-            last_engagement = row[2]
+        if not rows:
+            return {}
 
-            if apply_decay and last_engagement:
-                # Calculate weeks since last engagement
-                last_dt = datetime.fromisoformat(last_engagement)
-                weeks_since = (now - last_dt).days / 7.0
+        topics = [row[0] for row in rows]
+        scores = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
 
-                # Apply exponential decay: 0.95 per week
-                decayed_affinity = self.apply_time_decay(base_affinity, weeks_since)
-                affinities[topic] = decayed_affinity
-            else:
-                affinities[topic] = base_affinity
+        if apply_decay:
+            # Whole days since last engagement; NaN (no decay) when never engaged
+            now_ts = calendar.timegm(datetime.now().timetuple())
+            last_ts = np.fromiter(
+                (np.nan if row[2] is None else row[2] for row in rows),
+                dtype=np.float64,
+                count=len(rows)
+            )
+            weeks_since = np.floor((now_ts - last_ts) / 86400) / 7.0
 
-        conn.close()
-        return affinities
+            # Apply exponential decay: 0.95 per week, for all topics at once
+            decayed = self.apply_time_decay(scores, weeks_since)
+            scores = np.where(np.isnan(weeks_since), scores, decayed)
+
+        return dict(zip(topics, scores.tolist()))
 
     def apply_time_decay(self, affinity: float, weeks_since: float) -> float:
         """
@@ -124,94 +187,115 @@ class UserProfileService:
         Examples:
         - 8 weeks: drops ~33% (0.95^8 ≈ 0.66)
         - 16 weeks: drops ~55% (0.95^16 ≈ 0.44)
+
+        Accepts scalars or NumPy arrays (computed as exp(weeks * ln 0.95)).
+        Non-positive ages (engaged today, or clock skew) leave the score
+        unchanged.
         """
-        decay_rate = 0.95
-        return affinity * (decay_rate ** weeks_since)
+        if np.ndim(weeks_since) == 0:
+            if weeks_since <= 0.0:
+                return affinity
+            return affinity * math.exp(weeks_since * LOG_DECAY_RATE)
+
+        return affinity * np.exp(np.maximum(weeks_since, 0.0) * LOG_DECAY_RATE)
 
     def update_topic_affinity(
         self,
         user_id: str,
         topic: str,
-        delta: float
+        delta: float,
+        cursor=None,
+        now: Optional[str] = None
     ):
         """
         Update topic affinity by delta amount.
         Creates affinity if doesn't exist.
-        """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Get current affinity
-        cursor.execute("""
-            SELECT affinity_score FROM user_topic_affinities
-            WHERE user_id = ? AND topic = ?
-        """, (user_id, topic))
-
-        row = cursor.fetchone()
 
-        if row:
-            # Update existing affinity
-            new_affinity = max(0.0, min(1.0, row[0] + delta))  # Clamp to [0, 1]
-            cursor.execute("""
-                UPDATE user_topic_affinities
-                SET affinity_score = ?,
-                    last_engagement_at = ?,
-                    updated_at = ?
-                WHERE user_id = ? AND topic = ?
-            """, (new_affinity, datetime.now().isoformat(), datetime.now().isoformat(), user_id, topic))
-        else:
-            # Create new affinity
-            initial_affinity = max(0.0, min(1.0, 0.5 + delta))  # Start at 0.5, apply delta
-            cursor.execute("""
-                INSERT INTO user_topic_affinities
-                (user_id, topic, affinity_score, last_engagement_at, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (user_id, topic, initial_affinity, datetime.now().isoformat(), datetime.now().isoformat()))
-
-        conn.commit()
-        conn.close()
-
-    def increment_view_count(self, user_id: str):
-        """Increment total view count for user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        Pass a cursor to run inside the caller's transaction (caller commits),
+        and the caller's timestamp as now to reuse it for this write.
+        """
+        if now is None:
+            now = datetime.now().isoformat()
 
-        cursor.execute("""
-            UPDATE user_profiles
-            SET total_views = total_views + 1,
-                updated_at = ?
-            WHERE user_id = ?
-        """, (datetime.now().isoformat(), user_id))
+        params = {'user_id': user_id, 'topic': topic, 'delta': delta, 'now': now}
 
-        conn.commit()
-        conn.close()
+        if cursor is not None:
+            cursor.execute(self._SQL_UPSERT_AFFINITY, params)
+            return
 
-    def increment_like_count(self, user_id: str):
-        """Increment total like count for user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        conn = get_pooled_connection(self.db_path)
+        with conn:
+            conn.execute(self._SQL_UPSERT_AFFINITY, params)
+        release_connection(conn)
 
-        cursor.execute("""
-            UPDATE user_profiles
-            SET total_likes = total_likes + 1,
-                updated_at = ?
-            WHERE user_id = ?
-        """, (datetime.now().isoformat(), user_id))
+    def record_engagement(
+        self,
+        user_id: str,
+        action: Optional[str],
+        topic: Optional[str],
+        delta: float,
+        cursor=None,
+        now: Optional[str] = None
+    ):
+        """
+        Apply an engagement to the profile in one transaction: bump the
+        counter for action ('view', 'like', 'save'; None or other actions
+        skip it) and upsert the topic affinity by delta (skipped when there
+        is no topic or delta is 0).
 
-        conn.commit()
-        conn.close()
+        Pass a cursor to run inside the caller's transaction (caller commits).
+        """
+        if now is None:
+            now = datetime.now().isoformat()
 
-    def increment_save_count(self, user_id: str):
-        """Increment total save count for user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if cursor is not None:
+            self._apply_engagement(user_id, action, topic, delta, cursor, now)
+            return
 
-        cursor.execute("""
-            UPDATE user_profiles
-            SET total_saves = total_saves + 1,
-                updated_at = ?
-            WHERE user_id = ?
-        """, (datetime.now().isoformat(), user_id))
+        conn = get_pooled_connection(self.db_path)
+        with conn:
+            self._apply_engagement(user_id, action, topic, delta, conn.cursor(), now)
+        release_connection(conn)
 
-        conn.commit()
-        conn.close()
+    def _apply_engagement(
+        self,
+        user_id: str,
+        action: Optional[str],
+        topic: Optional[str],
+        delta: float,
+        cursor,
+        now: str
+    ):
+        """Counter and affinity writes for record_engagement on cursor"""
+        column = self._ACTION_COUNTERS.get(action)
+        if column:
+            self._increment(column, user_id, cursor, now)
+
+        if topic and delta != 0.0:
+            self.update_topic_affinity(user_id, topic, delta, cursor, now)
+
+    def increment_view_count(self, user_id: str, cursor=None, now: Optional[str] = None):
+        """Increment total view count for user (see record_engagement)"""
+        self._increment('total_views', user_id, cursor, now)
+
+    def increment_like_count(self, user_id: str, cursor=None, now: Optional[str] = None):
+        """Increment total like count for user (see record_engagement)"""
+        self._increment('total_likes', user_id, cursor, now)
+
+    def increment_save_count(self, user_id: str, cursor=None, now: Optional[str] = None):
+        """Increment total save count for user (see record_engagement)"""
+        self._increment('total_saves', user_id, cursor, now)
+
+    def _increment(self, column: str, user_id: str, cursor=None, now: Optional[str] = None):
+        """Increment one of the user_profiles total_* counters"""
+        if now is None:
+            now = datetime.now().isoformat()
+
+        if cursor is not None:
+            cursor.execute(self._SQL_INCREMENT[column], (now, user_id))
+            return
+
+        conn = get_pooled_connection(self.db_path)
+        with conn:
+            conn.execute(self._SQL_INCREMENT[column], (now, user_id))
+        release_connection(conn)
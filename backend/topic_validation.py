@@ -1,7 +1,10 @@
 """Topic validation with rule-based and optional SLM semantic checks."""
 
+import asyncio
 import re
-from typing import Tuple
+import sqlite3
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 from backend.utils.logger import setup_logger
 
@@ -10,9 +13,59 @@ logger = setup_logger(__name__)
 slm_pipeline = None
 slm_fallback_mode = False
 
+# Rule tables, built once at import
+_TOPIC_RE = re.compile(r'^[a-zA-Z0-9\s\-\'&]+$')
+_REASON_RE = re.compile(r'[Rr]eason:\s*(.+?)(?:\n|Suggestion:|$)')
+_SUGGESTION_RE = re.compile(r'[Ss]uggestion:\s*(.+?)(?:\n|$)')
 
-def init_slm(model_name: str = "meta-llama/Llama-3.2-1B-Instruct") -> bool:
-    """Initialize the SLM pipeline for topic validation."""
+_BANNED = frozenset({'test', 'asdf', 'qwerty', 'xxx', 'xxxx', 'fuck', 'shit', 'demo', 'example'})
+
+_VALID_ACRONYMS = frozenset({
+    'ai', 'ml', 'nlp', 'llm', 'slm', 'gpt',
+    'saas', 'paas', 'iaas',
+    'b2b', 'b2c', 'd2c',
+    'seo', 'sem', 'cro',
+    'hr', 'pr', 'ar', 'vr', 'xr',
+    'ios', 'api', 'sdk', 'cli',
+    'web3', 'defi', 'nft', 'dao',
+    'vc', 'pe', 'ipo', 'roi',
+    'ui', 'ux'
+})
+
+# Ordered: the first vague word found is the one reported
+_VAGUE_WORDS = ('stuff', 'things', 'content', 'random', 'misc', 'various', 'general')
+
+_QUESTION_PREFIXES = ('how ', 'what ', 'why ', 'when ', 'where ')
+
+# Keyboard mashes and filler words, matched in one pass
+_GIBBERISH_RE = re.compile(r'\b(?:asdf\w*|qwerty\w*|zxcv\w*|jkl\w*|blah|lorem|ipsum)\b', re.IGNORECASE)
+
+# Lowercased topics users already follow (accepted without rule checks)
+known_topics: frozenset = frozenset()
+
+# Enough for "VALID/INVALID", a one-line reason and a suggestion
+SLM_MAX_NEW_TOKENS = 32
+
+# Deep validations are batched: up to 8 prompts or 20ms, whichever comes first
+SLM_BATCH_SIZE = 8
+SLM_BATCH_WAIT_SECONDS = 0.02
+_slm_queue = None  # asyncio.Queue of (topic, future), created by slm_batch_worker
+
+# SLM verdicts per normalized topic, shared by validate_topic(deep=True) and
+# the batch worker so neither path re-runs the model for a topic the other
+# has already checked; cleared by init_slm() and when it reaches the cap
+SLM_RESULT_CACHE_SIZE = 4096
+_slm_results: Dict[str, Tuple[bool, str, str]] = {}
+
+
+def init_slm(model_name: str = "meta-llama/Llama-3.2-1B-Instruct", quantize: bool = True) -> bool:
+    """
+    Initialize the SLM pipeline for topic validation.
+
+    With quantize=True the model's Linear layers are dynamically quantized
+    to int8 (CPU inference), roughly halving memory; if quantization is
+    unavailable the FP32 model is kept.
+    """
     global slm_pipeline, slm_fallback_mode
 
     try:
@@ -29,17 +82,59 @@ def init_slm(model_name: str = "meta-llama/Llama-3.2-1B-Instruct") -> bool:
             temperature=0.1
         )
 
+        if quantize:
+            try:
+                import torch
+
+                slm_pipeline.model = torch.quantization.quantize_dynamic(
+                    slm_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                logger.info("Topic validation SLM quantized to int8")
+            except Exception as e:
+                logger.warning(f"SLM int8 quantization failed, using FP32: {e}")
+
+        # Batched generation needs a pad token; decoder-only models pad left
+        tokenizer = slm_pipeline.tokenizer
+        if tokenizer.pad_token_id is None:
+            tokenizer.pad_token_id = slm_pipeline.model.config.eos_token_id
+        tokenizer.padding_side = "left"
+
         logger.info("Topic validation SLM loaded successfully")
         slm_fallback_mode = False
+        _validate_topic_cached.cache_clear()
+        _slm_results.clear()
         return True
 
     except Exception as e:
         logger.error(f"Failed to load SLM: {e}")
         logger.warning("Falling back to strict rule-based validation")
         slm_fallback_mode = True
+        _validate_topic_cached.cache_clear()
+        _slm_results.clear()
         return False
 
 
+def load_known_topics(db_path: str) -> int:
+    """
+    Load followed topics from user_topics as the known-good topic set.
+
+    Returns number of known topics
+    """
+    global known_topics
+
+    try:
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT DISTINCT lower(topic) FROM user_topics").fetchall()
+        conn.close()
+    except Exception as e:
+        logger.error(f"Failed to load known topics: {e}")
+        return len(known_topics)
+
+    known_topics = frozenset(row[0] for row in rows)
+    _validate_topic_cached.cache_clear()
+    return len(known_topics)
+
+
 def basic_validation(topic: str) -> Tuple[bool, str, bool]:
     """
     Fast rule-based validation.
@@ -54,11 +149,10 @@ def basic_validation(topic: str) -> Tuple[bool, str, bool]:
     if len(topic) > 50:
         return False, "Topic too long (maximum 50 characters)", False
 
-    if not re.match(r'^[a-zA-Z0-9\s\-\'&]+$', topic):
+    if not _TOPIC_RE.match(topic):
         return False, "Only letters, numbers, spaces, and hyphens allowed", False
 
-    banned = ['test', 'asdf', 'qwerty', 'xxx', 'xxxx', 'fuck', 'shit', 'demo', 'example']
-    if topic.lower() in banned:
+    if topic.lower() in _BANNED:
         return False, "Invalid topic name", False
 
     if topic.replace(' ', '').replace('-', '').isdigit():
@@ -67,15 +161,9 @@ def basic_validation(topic: str) -> Tuple[bool, str, bool]:
     return True, "", True
 
 
-def validate_with_slm(topic: str) -> Tuple[bool, str, str]:
-    """SLM semantic validation. Returns: (is_valid, error_message, suggestion)"""
-    global slm_pipeline, slm_fallback_mode
-
-    if slm_fallback_mode or slm_pipeline is None:
-        return fallback_validation(topic)
-
-    try:
-        prompt = f"""Is "{topic}" a valid topic for a content feed?
+def _slm_prompt(topic: str) -> str:
+    """Build the SLM validation prompt for a topic."""
+    return f"""Is "{topic}" a valid topic for a content feed?
 
 Valid examples: AI agents, startup fundraising, DeFi, Web3, Y Combinator, machine learning
 Invalid examples: asdf jkl, stuff and things, random gibberish, blah blah blah
@@ -93,39 +181,51 @@ VALID or INVALID
 Reason: [brief explanation]
 Suggestion: [improved topic if invalid, or "none"]"""
 
-        # Generate response
-        response = slm_pipeline(
-            prompt,
-            max_new_tokens=60,
-            return_full_text=False
-        )[0]['generated_text']
 
-        # Parse response
-        response_upper = response.upper()
+def _parse_slm_response(response: str) -> Tuple[bool, str, str]:
+    """Parse SLM output into (is_valid, error_message, suggestion)."""
+    response_upper = response.upper()
 
-        # Check validity
-        is_valid = "VALID" in response_upper and "INVALID" not in response_upper
+    # Check validity
+    is_valid = "VALID" in response_upper and "INVALID" not in response_upper
 
-        # Extract reason
-        reason = ""
-        if "Reason:" in response or "reason:" in response.lower():
-            reason_match = re.search(r'[Rr]eason:\s*(.+?)(?:\n|Suggestion:|$)', response)
-            if reason_match:
-                reason = reason_match.group(1).strip()
+    # Extract reason
+    reason = ""
+    if "Reason:" in response or "reason:" in response.lower():
+        reason_match = _REASON_RE.search(response)
+        if reason_match:
+            reason = reason_match.group(1).strip()
 
-        # Extract suggestion
-        suggestion = ""
-        if not is_valid and ("Suggestion:" in response or "suggestion:" in response.lower()):
-            suggestion_match = re.search(r'[Ss]uggestion:\s*(.+?)(?:\n|$)', response)
-            if suggestion_match:
-                suggestion = suggestion_match.group(1).strip()
-                if suggestion.lower() in ['none', 'n/a', '']:
-                    suggestion = ""
+    # Extract suggestion
+    suggestion = ""
+    if not is_valid and ("Suggestion:" in response or "suggestion:" in response.lower()):
+        suggestion_match = _SUGGESTION_RE.search(response)
+        if suggestion_match:
+            suggestion = suggestion_match.group(1).strip()
+            if suggestion.lower() in ['none', 'n/a', '']:
+                suggestion = ""
 
-        # Format error message
-        error_message = reason if not is_valid else ""
+    # Format error message
+    error_message = reason if not is_valid else ""
+
+    return is_valid, error_message, suggestion
+
+
+def validate_with_slm(topic: str) -> Tuple[bool, str, str]:
+    """SLM semantic validation. Returns: (is_valid, error_message, suggestion)"""
+    global slm_pipeline, slm_fallback_mode
+
+    if slm_fallback_mode or slm_pipeline is None:
+        return fallback_validation(topic)
+
+    try:
+        response = slm_pipeline(
+            _slm_prompt(topic),
+            max_new_tokens=SLM_MAX_NEW_TOKENS,
+            return_full_text=False
+        )[0]['generated_text']
 
-        return is_valid, error_message, suggestion
+        return _parse_slm_response(response)
 
     except Exception as e:
         logger.error(f"SLM validation failed: {e}")
@@ -133,35 +233,147 @@ Suggestion: [improved topic if invalid, or "none"]"""
         return fallback_validation(topic)
 
 
+def validate_batch_with_slm(topics: List[str]) -> List[Tuple[bool, str, str]]:
+    """SLM semantic validation for several topics in one batched generate call."""
+    if slm_fallback_mode or slm_pipeline is None:
+        return [fallback_validation(topic) for topic in topics]
+
+    try:
+        outputs = slm_pipeline(
+            [_slm_prompt(topic) for topic in topics],
+            batch_size=SLM_BATCH_SIZE,
+            max_new_tokens=SLM_MAX_NEW_TOKENS,
+            return_full_text=False
+        )
+        return [_parse_slm_response(output[0]['generated_text']) for output in outputs]
+
+    except Exception as e:
+        logger.error(f"SLM batch validation failed: {e}")
+        logger.warning("Falling back to strict rule validation")
+        return [fallback_validation(topic) for topic in topics]
+
+
+def _remember_slm_result(topic: str, result: Tuple[bool, str, str]):
+    """Store an SLM verdict for a normalized topic in _slm_results."""
+    if len(_slm_results) >= SLM_RESULT_CACHE_SIZE:
+        _slm_results.clear()
+    _slm_results[topic] = result
+
+
+def _cached_slm_validation(topic: str) -> Tuple[bool, str, str]:
+    """validate_with_slm for a normalized topic, through _slm_results."""
+    result = _slm_results.get(topic)
+    if result is None:
+        result = validate_with_slm(topic)
+        _remember_slm_result(topic, result)
+    return result
+
+
+def slm_ready() -> bool:
+    """True once init_slm() has loaded a model (not in fallback mode)"""
+    return slm_pipeline is not None and not slm_fallback_mode
+
+
+async def slm_batch_worker():
+    """
+    Drain queued deep validations and run them through the SLM in batches.
+
+    Waits for one request, then collects more for up to
+    SLM_BATCH_WAIT_SECONDS (or until SLM_BATCH_SIZE are queued) and
+    validates them with one batched forward pass off the event loop.
+    When the worker stops (e.g. cancelled on shutdown), requests still
+    queued or in flight get the fallback_validation result.
+    """
+    global _slm_queue
+
+    loop = asyncio.get_running_loop()
+    _slm_queue = asyncio.Queue()
+    batch = []
+
+    try:
+        while True:
+            batch = [await _slm_queue.get()]
+            deadline = loop.time() + SLM_BATCH_WAIT_SECONDS
+
+            while len(batch) < SLM_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(_slm_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            topics = [topic for topic, _ in batch]
+            try:
+                results = await asyncio.to_thread(validate_batch_with_slm, topics)
+            except Exception as e:
+                logger.error(f"SLM batch worker failed: {e}")
+                results = [fallback_validation(topic) for topic in topics]
+
+            for (topic, future), result in zip(batch, results):
+                _remember_slm_result(topic, result)
+                if not future.done():
+                    future.set_result(result)
+            batch = []
+    finally:
+        # New requests go to validate_topic; nobody is left waiting on us
+        queue, _slm_queue = _slm_queue, None
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        for topic, future in batch:
+            if not future.done():
+                future.set_result(fallback_validation(topic))
+
+
+async def validate_topic_async(topic: str, deep: bool = False) -> Tuple[bool, str, str]:
+    """
+    validate_topic for async request handlers.
+
+    deep=True queues the SLM check for slm_batch_worker (started on app
+    startup once the SLM is loaded) instead of running the model on the
+    request thread; without a running worker it falls back to
+    validate_topic in a thread. Verdicts are shared with validate_topic
+    through _slm_results.
+    """
+    if not deep or not slm_ready():
+        return validate_topic(topic, deep)
+
+    if _slm_queue is None:
+        return await asyncio.to_thread(validate_topic, topic, deep)
+
+    normalized = topic.strip().lower()
+    valid, error, needs_slm = basic_validation(normalized)
+    if not needs_slm:
+        return valid, error, ""
+
+    cached = _slm_results.get(normalized)
+    if cached is not None:
+        return cached
+
+    future = asyncio.get_running_loop().create_future()
+    await _slm_queue.put((normalized, future))
+    return await future
+
+
+@lru_cache(maxsize=4096)
 def fallback_validation(topic: str) -> Tuple[bool, str, str]:
     """Strict rule-based validation when SLM is unavailable."""
     topic_lower = topic.lower()
     words = topic.split()
 
-    valid_acronyms = [
-        'ai', 'ml', 'nlp', 'llm', 'slm', 'gpt',
-        'saas', 'paas', 'iaas',
-        'b2b', 'b2c', 'd2c',
-        'seo', 'sem', 'cro',
-        'hr', 'pr', 'ar', 'vr', 'xr',
-        'ios', 'api', 'sdk', 'cli',
-        'web3', 'defi', 'nft', 'dao',
-        'vc', 'pe', 'ipo', 'roi',
-        'ui', 'ux'
-    ]
-
-    is_acronym = topic_lower in valid_acronyms
+    is_acronym = topic_lower in _VALID_ACRONYMS
 
     if len(words) == 1 and len(topic) <= 4:
         if not is_acronym:
             return False, "Short topics must be recognized acronyms (AI, ML, etc.)", "Try a more descriptive topic"
 
-    vague_words = ['stuff', 'things', 'content', 'random', 'misc', 'various', 'general']
-    for vague in vague_words:
-        if vague in topic_lower.split():
+    topic_words = set(topic_lower.split())
+    for vague in _VAGUE_WORDS:
+        if vague in topic_words:
             return False, f"Topic too vague: '{vague}'", "Be more specific about your interest"
 
-    if topic_lower.startswith(('how ', 'what ', 'why ', 'when ', 'where ')):
+    if topic_lower.startswith(_QUESTION_PREFIXES):
         return False, "Topics should be nouns/phrases, not questions", "Rephrase as a topic (e.g., 'Python programming')"
 
     has_substantial_word = any(len(word) >= 3 for word in words)
@@ -171,18 +383,47 @@ def fallback_validation(topic: str) -> Tuple[bool, str, str]:
     return True, "", ""
 
 
-def validate_topic(topic: str) -> Tuple[bool, str, str]:
+def rule_validation(topic: str) -> Tuple[bool, str, str]:
+    """
+    Model-free semantic check used on the request path.
+
+    Known topics pass, keyboard mashes fail, everything else goes through
+    the strict fallback rules.
+    """
+    if topic.lower() in known_topics:
+        return True, "", ""
+
+    if _GIBBERISH_RE.search(topic):
+        return False, "Topic looks like random characters", "Try a real topic (e.g., 'AI agents')"
+
+    return fallback_validation(topic)
+
+
+def validate_topic(topic: str, deep: bool = False) -> Tuple[bool, str, str]:
     """
     Main validation entry point.
 
+    Uses rule_validation by default; deep=True routes the semantic check
+    to the SLM instead. Results are cached per normalized (stripped,
+    lowercased) topic; init_slm() and load_known_topics() clear the cache.
+
     Returns: (is_valid, error_message, suggestion)
     """
+    return _validate_topic_cached(topic.strip().lower(), deep)
+
+
+@lru_cache(maxsize=4096)
+def _validate_topic_cached(topic: str, deep: bool = False) -> Tuple[bool, str, str]:
+    """validate_topic for an already-normalized topic (memoized)."""
     valid, error, needs_slm = basic_validation(topic)
 
     if not needs_slm:
         return valid, error, ""
 
-    return validate_with_slm(topic)
+    if deep:
+        return _cached_slm_validation(topic)
+
+    return rule_validation(topic)
 
 
 def suggest_topic_improvements(topic: str) -> str:
@@ -214,7 +455,7 @@ def suggest_topic_improvements(topic: str) -> str:
                 return suggestion
 
     # Question format
-    if topic_lower.startswith(('how ', 'what ', 'why ', 'when ', 'where ')):
+    if topic_lower.startswith(_QUESTION_PREFIXES):
         return 'Rephrase as a topic rather than a question (e.g., "Python programming" instead of "how to learn Python")'
 
     # All good
@@ -243,9 +484,8 @@ def test_validation():
     for topic, expected_valid in test_cases:
         valid, error, suggestion = validate_topic(topic)
         status = "PASS" if valid == expected_valid else "FAIL"
-        logger.info(f"{status}: '{topic}' - valid={valid}, error='{error}', suggestion='{suggestion}'")
+        logger.info("%s: '%s' - valid=%s, error='%s', suggestion='%s'", status, topic, valid, error, suggestion)
 
 
 if __name__ == "__main__":
-    init_slm()
     test_validation()
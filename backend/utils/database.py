@@ -1,35 +1,237 @@
 """Database connection utilities."""
 
+import atexit
 import sqlite3
 import os
+import threading
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Dict, Generator, List
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 DB_PATH = os.path.join(PROJECT_ROOT, "insights.db")
 
+# Connection tuning for a read-heavy service with bursty small writes:
+# WAL lets readers proceed during writes, NORMAL skips the per-commit fsync
+# (still durable at checkpoints under WAL), and the cache/mmap sizes keep
+# hot pages in memory.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+# Prepared statements kept per pooled connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+
+# SQL expression for a random (version 4) UUID in canonical text form, so bulk
+# INSERT ... SELECT/VALUES can mint ids without a Python call per row
+UUID4_SQL = (
+    "lower(hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' ||"
+    " substr(hex(randomblob(2)), 2) || '-' ||"
+    " substr('89ab', 1 + (abs(random()) % 4), 1) ||"
+    " substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6)))"
+)
+
+
+def apply_pragmas(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Apply the standard connection PRAGMAs.
+
+    Args:
+        conn: Open SQLite connection
+
+    Returns:
+        The same connection, for chaining
+    """
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+_local = threading.local()
+
+# Every pooled connection across threads -> the thread that owns it, so
+# connections can be closed at exit without touching a live thread's
+_open_connections: Dict[sqlite3.Connection, threading.Thread] = {}
+_open_connections_lock = threading.Lock()
+
+
+def get_pooled_connection(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """
+    Get this thread's reusable connection for db_path.
+
+    Connections are opened once per (thread, db_path) with PRAGMAs applied,
+    sqlite3.Row rows and a STATEMENT_CACHE_SIZE statement cache, and stay
+    open until close_pooled_connections() or interpreter exit. Callers must
+    not close them; hand them back with release_connection() instead.
+
+    Every caller on a thread gets the same connection, so code that calls
+    into another service while it has uncommitted writes must pass its
+    cursor along rather than letting the callee check the connection out
+    again (see UserProfileService.record_engagement). Write paths should
+    commit or roll back before they can raise (with conn: ...), so no
+    transaction is left open for the next checkout.
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        Pooled SQLite connection
+
+    Raises:
+        sqlite3.ProgrammingError: The connection still has an open
+            transaction (a nested checkout, or an earlier caller that
+            neither committed nor rolled back)
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(db_path)
+    if conn is None:
+        # Only this thread uses it; check_same_thread=False lets atexit close
+        # it once this thread has exited
+        conn = apply_pragmas(sqlite3.connect(
+            db_path, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False
+        ))
+        conn.row_factory = sqlite3.Row
+        connections[db_path] = conn
+        with _open_connections_lock:
+            _open_connections[conn] = threading.current_thread()
+    elif conn.in_transaction:
+        # Rolling back here would silently discard someone else's writes
+        raise sqlite3.ProgrammingError(
+            f"Pooled connection to {db_path} checked out with an open transaction"
+        )
+    return conn
+
+
+def release_connection(conn: sqlite3.Connection) -> None:
+    """
+    Return a pooled connection, discarding any uncommitted work.
+
+    Only the releasing caller's own work can be left uncommitted here:
+    get_pooled_connection() refuses to hand out a connection that is
+    mid-transaction, so no nested caller holds it over another's writes.
+
+    Args:
+        conn: Connection obtained from get_pooled_connection()
+    """
+    if conn.in_transaction:
+        conn.rollback()
+
+
+def close_pooled_connections() -> None:
+    """Close all pooled connections owned by the current thread."""
+    connections = getattr(_local, "connections", None) or {}
+    with _open_connections_lock:
+        for conn in connections.values():
+            _open_connections.pop(conn, None)
+            conn.close()
+    connections.clear()
+
+
+@atexit.register
+def _close_all_pooled_connections() -> None:
+    """
+    Close pooled connections on shutdown (checkpoints WAL).
+
+    Only this thread's connections and those whose owner thread has exited
+    are closed; a thread still running (e.g. a threadpool worker) may be
+    mid-query on its own, so those are left for process exit.
+
+    Each connection runs PRAGMA optimize first, so planner statistics for
+    the tables it queried are refreshed when they have drifted.
+    """
+    current = threading.current_thread()
+    with _open_connections_lock:
+        for conn, owner in list(_open_connections.items()):
+            if owner is not current and owner.is_alive():
+                continue
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            del _open_connections[conn]
+
 
 @contextmanager
 def get_db_connection() -> Generator[sqlite3.Connection, None, None]:
     """
     Context manager for database connections.
 
-    Automatically handles connection cleanup.
+    Borrows this thread's pooled connection and releases it on exit
+    (uncommitted work is rolled back, the connection stays open).
 
     Usage:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT ...")
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_pooled_connection(DB_PATH)
     try:
         yield conn
     finally:
-        conn.close()
+        release_connection(conn)
+
+
+@contextmanager
+def deferred_indexes(conn: sqlite3.Connection, table: str) -> Generator[None, None, None]:
+    """
+    Drop a table's secondary indexes for a bulk load and rebuild them after.
+
+    Building each index once at the end is much cheaper than updating every
+    B-tree per inserted row. UNIQUE indexes (and the automatic ones behind
+    PRIMARY KEY/UNIQUE constraints) are kept so conflicts are still caught.
+
+    Usage:
+        with deferred_indexes(conn, "insights"):
+            cursor.executemany("INSERT INTO insights ...", rows)
+    """
+    indexes = conn.execute("""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL
+          AND sql NOT LIKE 'CREATE UNIQUE INDEX%'
+    """, (table,)).fetchall()
+
+    for name, _ in indexes:
+        conn.execute(f'DROP INDEX "{name}"')
+    conn.commit()
+
+    try:
+        yield
+    except BaseException:
+        # Don't commit a half-done load along with the rebuilt indexes
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        for _, sql in indexes:
+            conn.execute(sql)
+        conn.commit()
+
+
+def as_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    """
+    Convert a row to a plain dict (e.g. for JSON responses).
+
+    Args:
+        row: Row returned by execute_query()
+
+    Returns:
+        Column name -> value mapping
+    """
+    return dict(row)
 
 
-def execute_query(query: str, params: tuple = ()) -> list:
+def execute_query(query: str, params: tuple = ()) -> List[sqlite3.Row]:
     """
     Execute a query and return all results.
 
@@ -38,12 +240,13 @@ def execute_query(query: str, params: tuple = ()) -> list:
         params: Query parameters
 
     Returns:
-        List of rows as dictionaries
+        List of sqlite3.Row (index and column-name access); use as_dict()
+        where a real dict is needed
     """
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
 
 
 def execute_write(query: str, params: tuple = ()) -> int:
@@ -1,12 +1,18 @@
 """Logging configuration."""
 
 import logging
+import os
 import sys
 
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
     Create and configure a logger.
 
+    With FEED_QUIET=1 in the environment the level is raised to at least
+    WARNING, so info/debug calls return at the isEnabledFor check. Prefer
+    lazy arguments on hot paths, e.g. logger.info("Loaded %s rows", n),
+    so disabled messages are never formatted.
+
     Args:
         name: Logger name (typically __name__)
         level: Logging level
@@ -14,6 +20,9 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     Returns:
         Configured logger instance
     """
+    if os.getenv("FEED_QUIET") == "1":
+        level = max(level, logging.WARNING)
+
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
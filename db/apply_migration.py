@@ -1,11 +1,26 @@
 """Apply database migrations"""
 import sqlite3
 import os
+import re
 import sys
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.utils.database import apply_pragmas
+
 DB_PATH = os.path.join(PROJECT_ROOT, "insights.db")
 
+# Scripts that manage their own transaction (e.g. table rebuilds) run as-is.
+# Matches "BEGIN;"/"BEGIN IMMEDIATE;"/"COMMIT", not trigger bodies' BEGIN ... END;
+SELF_TRANSACTED_RE = re.compile(
+    r'^\s*(?:BEGIN\b[^;\n]*;|COMMIT\b|END\s+TRANSACTION\b)', re.IGNORECASE | re.MULTILINE
+)
+
+# Page cache while a migration runs (256 MB); per connection, so it ends
+# with the migration's connection
+MIGRATION_CACHE_SIZE = -262144
+
 def apply_migration(migration_file: str):
     """Apply a SQL migration file"""
     migration_path = os.path.join(PROJECT_ROOT, "db", "migrations", migration_file)
@@ -19,17 +34,29 @@ def apply_migration(migration_file: str):
     with open(migration_path, 'r') as f:
         sql = f.read()
 
+    # One transaction for the whole script: a single journal sync instead
+    # of one per statement, and a failed migration leaves nothing behind
+    if not SELF_TRANSACTED_RE.search(sql):
+        sql = f"BEGIN;\n{sql}\nCOMMIT;"
+
+    # WAL + synchronous=NORMAL: the commit doesn't wait on a journal fsync
+    conn = apply_pragmas(sqlite3.connect(DB_PATH))
+    cursor = conn.cursor()
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=OFF")
+        cursor.execute(f"PRAGMA cache_size={MIGRATION_CACHE_SIZE}")
         cursor.executescript(sql)
-        conn.commit()
-        conn.close()
+        # Refresh planner statistics for any tables/indexes the script changed
+        cursor.execute("PRAGMA optimize")
         print(f"Successfully applied {migration_file}")
         return True
     except Exception as e:
+        if conn.in_transaction:
+            conn.rollback()
         print(f"Error applying migration: {e}")
         return False
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
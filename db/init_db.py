@@ -5,8 +5,13 @@ Run this before starting the backend server
 
 import sqlite3
 import os
+import sys
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Go up to project root
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.utils.database import apply_pragmas
+
 DB_PATH = os.path.join(PROJECT_ROOT, "insights.db")
 SCHEMA_PATH = os.path.join(PROJECT_ROOT, "db", "schema.sql")
 
@@ -23,11 +28,14 @@ def init_database():
     with open(SCHEMA_PATH, 'r') as f:
         schema = f.read()
     
-    # Connect and execute
-    conn = sqlite3.connect(DB_PATH)
+    # Connect and execute (WAL is persistent, so this also covers later writers)
+    conn = apply_pragmas(sqlite3.connect(DB_PATH))
     cursor = conn.cursor()
     
     try:
+        cursor.execute("PRAGMA journal_mode")
+        print(f"📒 Journal mode: {cursor.fetchone()[0]}")
+
         cursor.executescript(schema)
         conn.commit()
         print("✅ Database initialized successfully")
@@ -22,7 +22,8 @@ CREATE TABLE IF NOT EXISTS extraction_jobs (
 );
 
 -- Indexes for efficient querying
-CREATE INDEX IF NOT EXISTS idx_extraction_jobs_topic ON extraction_jobs(topic);
+-- Latest job per topic (replaces the plain topic index, see migration 015)
+CREATE INDEX IF NOT EXISTS idx_extraction_jobs_topic_created ON extraction_jobs(topic, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_extraction_jobs_status ON extraction_jobs(status);
 CREATE INDEX IF NOT EXISTS idx_extraction_jobs_user_id ON extraction_jobs(user_id);
 CREATE INDEX IF NOT EXISTS idx_extraction_jobs_priority ON extraction_jobs(priority DESC);
@@ -0,0 +1,49 @@
+-- Migration 006: INTEGER primary key for user_engagement
+-- Replaces the TEXT UUID id with an INTEGER PRIMARY KEY (rowid alias), so
+-- rows need no Python-side id generation and the table/index B-trees shrink.
+--
+-- SQLite can't change a primary key in place, so the table is rebuilt.
+-- DROP TABLE also drops its indexes; the ones from 001/003 are recreated
+-- below. It runs before any later migration adds indexes or triggers on
+-- user_engagement, so those are created once, on the rebuilt table.
+-- Run once, after migrations 001-005.
+
+-- Don't re-validate unrelated views (e.g. legacy v_legacy_insights) on rename
+PRAGMA legacy_alter_table=ON;
+
+BEGIN;
+
+CREATE TABLE user_engagement_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    insight_id TEXT NOT NULL,
+    action TEXT NOT NULL,  -- 'view', 'like', 'save', 'dismiss'
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (insight_id) REFERENCES insights(id) ON DELETE CASCADE
+);
+
+-- Keep historical order so ids stay roughly chronological
+INSERT INTO user_engagement_new (user_id, insight_id, action, created_at)
+SELECT user_id, insight_id, action, created_at
+FROM user_engagement
+ORDER BY created_at, rowid;
+
+DROP TABLE user_engagement;
+ALTER TABLE user_engagement_new RENAME TO user_engagement;
+
+-- ============================================================================
+-- INDEXES
+-- ============================================================================
+CREATE INDEX IF NOT EXISTS idx_user_engagement_user ON user_engagement(user_id);
+CREATE INDEX IF NOT EXISTS idx_user_engagement_insight ON user_engagement(insight_id);
+CREATE INDEX IF NOT EXISTS idx_user_engagement_action ON user_engagement(action);
+CREATE INDEX IF NOT EXISTS idx_user_engagement_created_at ON user_engagement(created_at);
+CREATE INDEX IF NOT EXISTS idx_user_engagement_user_insight_action ON user_engagement(user_id, insight_id, action);
+CREATE INDEX IF NOT EXISTS idx_user_engagement_insight_action_created ON user_engagement(insight_id, action, created_at DESC);
+
+COMMIT;
+
+PRAGMA legacy_alter_table=OFF;
+
+ANALYZE;
@@ -0,0 +1,6 @@
+-- Migration 007: Covering index for seen-insight exclusion
+-- Feed queries exclude viewed insights with
+--   NOT EXISTS (SELECT 1 FROM user_engagement WHERE user_id = ? AND action = 'view' AND insight_id = i.id)
+-- Leading with (user_id, action) makes that probe an index-only lookup
+
+CREATE INDEX IF NOT EXISTS idx_eng_user_action_insight ON user_engagement(user_id, action, insight_id);
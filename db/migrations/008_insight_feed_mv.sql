@@ -0,0 +1,75 @@
+-- Migration 008: Materialized feed view for For You candidate selection
+-- insight_feed_mv keeps one row per non-archived insight with its base
+-- ranking inputs, so the candidate pool is a top-K scan of an index instead
+-- of a sort over the whole insights table.
+--
+-- Rows are maintained by triggers on insights (engagement writes update
+-- insights.engagement_score, which flows through here). freshness_cached is
+-- computed at write time and refreshed periodically by
+-- FeedService.refresh_feed_mv().
+
+CREATE TABLE IF NOT EXISTS insight_feed_mv (
+    id TEXT PRIMARY KEY,  -- insights.id
+    topic TEXT NOT NULL,
+    category TEXT,
+    source_domain TEXT,
+    quality_score REAL DEFAULT 0,
+    engagement_score REAL DEFAULT 0,
+    freshness_cached REAL DEFAULT 0,  -- 0-1, linear decay over 30 days
+    created_at TIMESTAMP
+);
+
+-- Base feed score: quality (20%) + social proof (15%) + freshness (20%)
+CREATE INDEX IF NOT EXISTS idx_insight_feed_mv_base_score ON insight_feed_mv(
+    (quality_score / 10.0 * 0.20 + engagement_score * 0.15 + freshness_cached * 0.20) DESC
+);
+
+-- ============================================================================
+-- TRIGGERS (keep insight_feed_mv in sync with insights)
+-- ============================================================================
+CREATE TRIGGER IF NOT EXISTS trg_insight_feed_mv_insert
+AFTER INSERT ON insights
+WHEN COALESCE(NEW.is_archived, 0) = 0
+BEGIN
+    INSERT OR REPLACE INTO insight_feed_mv
+    (id, topic, category, source_domain, quality_score, engagement_score, freshness_cached, created_at)
+    VALUES (
+        NEW.id, NEW.topic, NEW.category, NEW.source_domain,
+        COALESCE(NEW.quality_score, 0), COALESCE(NEW.engagement_score, 0),
+        MAX(0, 1.0 - (julianday('now') - julianday(NEW.created_at)) / 30.0),
+        NEW.created_at
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_insight_feed_mv_update
+AFTER UPDATE OF topic, category, source_domain, quality_score, engagement_score, created_at, is_archived ON insights
+BEGIN
+    DELETE FROM insight_feed_mv WHERE id = OLD.id;
+    INSERT INTO insight_feed_mv
+    (id, topic, category, source_domain, quality_score, engagement_score, freshness_cached, created_at)
+    SELECT
+        NEW.id, NEW.topic, NEW.category, NEW.source_domain,
+        COALESCE(NEW.quality_score, 0), COALESCE(NEW.engagement_score, 0),
+        MAX(0, 1.0 - (julianday('now') - julianday(NEW.created_at)) / 30.0),
+        NEW.created_at
+    WHERE COALESCE(NEW.is_archived, 0) = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_insight_feed_mv_delete
+AFTER DELETE ON insights
+BEGIN
+    DELETE FROM insight_feed_mv WHERE id = OLD.id;
+END;
+
+-- ============================================================================
+-- BACKFILL (existing insights)
+-- ============================================================================
+INSERT OR REPLACE INTO insight_feed_mv
+(id, topic, category, source_domain, quality_score, engagement_score, freshness_cached, created_at)
+SELECT
+    id, topic, category, source_domain,
+    COALESCE(quality_score, 0), COALESCE(engagement_score, 0),
+    MAX(0, 1.0 - (julianday('now') - julianday(created_at)) / 30.0),
+    created_at
+FROM insights
+WHERE COALESCE(is_archived, 0) = 0;
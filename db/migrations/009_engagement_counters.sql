@@ -0,0 +1,82 @@
+-- Migration 009: Incremental engagement counters on insights
+-- Keeps distinct-user view/like/save counts on the insights row so that
+-- engagement_score = min((likes + saves) / views, 1.0) is maintained in O(1)
+-- per engagement write instead of re-aggregating user_engagement.
+--
+-- Run once: SQLite has no ADD COLUMN IF NOT EXISTS.
+
+ALTER TABLE insights ADD COLUMN views_count INTEGER DEFAULT 0;
+ALTER TABLE insights ADD COLUMN likes_count INTEGER DEFAULT 0;
+ALTER TABLE insights ADD COLUMN saves_count INTEGER DEFAULT 0;
+
+-- ============================================================================
+-- TRIGGERS
+-- ============================================================================
+
+-- Count a user once per (insight, action), matching COUNT(DISTINCT user_id)
+CREATE TRIGGER IF NOT EXISTS trg_eng_ai
+AFTER INSERT ON user_engagement
+WHEN NEW.action IN ('view', 'like', 'save')
+AND NOT EXISTS (
+    SELECT 1 FROM user_engagement
+    WHERE user_id = NEW.user_id
+      AND insight_id = NEW.insight_id
+      AND action = NEW.action
+      AND rowid != NEW.rowid
+)
+BEGIN
+    UPDATE insights
+    SET views_count = views_count + (NEW.action = 'view'),
+        likes_count = likes_count + (NEW.action = 'like'),
+        saves_count = saves_count + (NEW.action = 'save')
+    WHERE id = NEW.insight_id;
+END;
+
+-- Un-like / un-save: decrement once the user's last row for the action is gone
+CREATE TRIGGER IF NOT EXISTS trg_eng_ad
+AFTER DELETE ON user_engagement
+WHEN OLD.action IN ('view', 'like', 'save')
+AND NOT EXISTS (
+    SELECT 1 FROM user_engagement
+    WHERE user_id = OLD.user_id
+      AND insight_id = OLD.insight_id
+      AND action = OLD.action
+)
+BEGIN
+    UPDATE insights
+    SET views_count = MAX(0, views_count - (OLD.action = 'view')),
+        likes_count = MAX(0, likes_count - (OLD.action = 'like')),
+        saves_count = MAX(0, saves_count - (OLD.action = 'save'))
+    WHERE id = OLD.insight_id;
+END;
+
+-- Derive engagement_score from the counters whenever they change
+CREATE TRIGGER IF NOT EXISTS trg_insights_engagement_score
+AFTER UPDATE OF views_count, likes_count, saves_count ON insights
+BEGIN
+    UPDATE insights
+    SET engagement_score = CASE
+            WHEN NEW.views_count > 0
+            THEN MIN(1.0, (NEW.likes_count + NEW.saves_count) * 1.0 / NEW.views_count)
+            ELSE 0.0
+        END,
+        updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')
+    WHERE id = NEW.id;
+END;
+
+-- ============================================================================
+-- BACKFILL (existing engagement)
+-- ============================================================================
+UPDATE insights
+SET views_count = (
+        SELECT COUNT(DISTINCT user_id) FROM user_engagement
+        WHERE insight_id = insights.id AND action = 'view'
+    ),
+    likes_count = (
+        SELECT COUNT(DISTINCT user_id) FROM user_engagement
+        WHERE insight_id = insights.id AND action = 'like'
+    ),
+    saves_count = (
+        SELECT COUNT(DISTINCT user_id) FROM user_engagement
+        WHERE insight_id = insights.id AND action = 'save'
+    );
@@ -0,0 +1,16 @@
+-- Migration 010: Integer epoch copy of insights.created_at
+-- Scoring reads created_at_epoch directly instead of parsing the ISO string
+-- per row (in SQL via strftime/julianday, or in Python via fromisoformat).
+-- The value is strftime('%s', created_at), i.e. the stored naive timestamp
+-- read as UTC, so differences against the same conversion of "now" keep the
+-- existing day arithmetic.
+--
+-- A VIRTUAL generated column: nothing extra is written per inserted row
+-- (bulk loads stay single-write), and the index below stores the value.
+--
+-- Run once: SQLite has no ADD COLUMN IF NOT EXISTS.
+
+ALTER TABLE insights ADD COLUMN created_at_epoch INTEGER
+    GENERATED ALWAYS AS (CAST(strftime('%s', created_at) AS INTEGER)) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS idx_insights_created_at_epoch ON insights(created_at_epoch);
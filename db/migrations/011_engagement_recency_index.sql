@@ -0,0 +1,16 @@
+-- Migration 011: Covering index for "last shown" lookups
+-- _get_last_shown_topic runs
+--   WHERE user_id = ? AND action = 'view' ORDER BY created_at DESC LIMIT 1
+-- This index answers it with a single seek and carries insight_id for the
+-- join, so no user_engagement row fetch is needed.
+--
+-- The other hot lookups are already covered:
+--   recent likes/saves per insight -> idx_user_engagement_insight_action_created (003)
+--   seen-insight NOT EXISTS probe  -> idx_eng_user_action_insight (007)
+--   user_topics by user            -> PRIMARY KEY (user_id, topic) (001)
+--   following feed by topic        -> idx_insights_archived_topic_created (003)
+
+CREATE INDEX IF NOT EXISTS idx_eng_user_action_created ON user_engagement(user_id, action, created_at DESC, insight_id);
+
+-- Refresh planner statistics so the new index is considered
+ANALYZE;
@@ -0,0 +1,17 @@
+-- Migration 012: One user_engagement row per (user, insight, action)
+-- The id primary key never collides, so INSERT OR IGNORE let repeat views
+-- pile up. A composite UNIQUE index gives it a real constraint to hit.
+
+-- Remove existing duplicates, keeping the earliest row of each tuple
+-- (trg_eng_ad leaves counters alone while one row of the tuple remains)
+DELETE FROM user_engagement
+WHERE rowid NOT IN (
+    SELECT MIN(rowid)
+    FROM user_engagement
+    GROUP BY user_id, insight_id, action
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_eng_uai ON user_engagement(user_id, insight_id, action);
+
+-- Superseded by uq_eng_uai (same columns)
+DROP INDEX IF EXISTS idx_user_engagement_user_insight_action;
@@ -0,0 +1,16 @@
+-- Migration 013: Integer epoch copy of user_topic_affinities.last_engagement_at
+-- get_topic_affinities reads last_engagement_epoch for time decay instead of
+-- parsing the ISO string per row with datetime.fromisoformat. Same
+-- conversion as insights.created_at_epoch (010): strftime('%s', ...) of the
+-- stored naive timestamp.
+--
+-- Writers (UserProfileService, db/backfill_affinities.py) set both columns;
+-- readers fall back to last_engagement_at for rows the epoch is missing on.
+--
+-- Run once: SQLite has no ADD COLUMN IF NOT EXISTS.
+
+ALTER TABLE user_topic_affinities ADD COLUMN last_engagement_epoch INTEGER;
+
+UPDATE user_topic_affinities
+SET last_engagement_epoch = CAST(strftime('%s', last_engagement_at) AS INTEGER)
+WHERE last_engagement_at IS NOT NULL;
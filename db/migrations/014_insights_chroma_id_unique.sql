@@ -0,0 +1,31 @@
+-- Migration 014: One insights row per ChromaDB id
+-- idx_insights_chroma (001) is a plain index and insights.id is a fresh UUID
+-- per insert, so INSERT OR IGNORE never fired for a re-synced ChromaDB row.
+-- A UNIQUE index lets the sync dedup with ON CONFLICT(chroma_id) DO NOTHING
+-- instead of a lookup per row. NULL chroma_ids (legacy rows) stay allowed.
+
+-- Remove existing duplicates, keeping the earliest row of each chroma_id
+-- (foreign keys are off during migrations, so drop their engagement too)
+DELETE FROM user_engagement
+WHERE insight_id IN (
+    SELECT id FROM insights
+    WHERE chroma_id IS NOT NULL
+      AND rowid NOT IN (
+          SELECT MIN(rowid) FROM insights
+          WHERE chroma_id IS NOT NULL
+          GROUP BY chroma_id
+      )
+);
+
+DELETE FROM insights
+WHERE chroma_id IS NOT NULL
+  AND rowid NOT IN (
+      SELECT MIN(rowid) FROM insights
+      WHERE chroma_id IS NOT NULL
+      GROUP BY chroma_id
+  );
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_insights_chroma_id ON insights(chroma_id);
+
+-- Superseded by uq_insights_chroma_id (same column)
+DROP INDEX IF EXISTS idx_insights_chroma;
@@ -0,0 +1,21 @@
+-- Migration 015: Latest-job-per-topic index for extraction_jobs
+-- Job dispatch itself runs from the in-memory PriorityQueue in
+-- backend/extraction_queue.py, so no SQL reads "next queued job". The hot
+-- reads are the latest job for a topic, polled by the frontend while an
+-- extraction runs:
+--   WHERE topic = ? ORDER BY created_at DESC LIMIT 1
+--   WHERE topic = ? AND status = 'failed' ORDER BY created_at DESC LIMIT 1
+-- idx_extraction_jobs_topic (002) finds the topic's rows but then sorts them;
+-- this index answers both with a single seek.
+--
+-- Duplicate-job checks (topic + active status) are covered by
+-- idx_extraction_jobs_active (002). Run after migration 002; databases
+-- created from the current 002 already have this index.
+
+CREATE INDEX IF NOT EXISTS idx_extraction_jobs_topic_created ON extraction_jobs(topic, created_at DESC);
+
+-- Superseded by idx_extraction_jobs_topic_created (same leading column)
+DROP INDEX IF EXISTS idx_extraction_jobs_topic;
+
+-- Refresh planner statistics so the new index is considered
+ANALYZE;
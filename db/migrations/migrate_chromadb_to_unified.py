@@ -10,10 +10,12 @@ Strategy:
 """
 import sqlite3
 import chromadb
-import uuid
 import os
+import queue
+import re
 import sys
 import json
+import threading
 from datetime import datetime
 from typing import Dict, List
 
@@ -21,10 +23,19 @@ from typing import Dict, List
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
+from backend.utils.database import UUID4_SQL, apply_pragmas, deferred_indexes
+
 # Paths
 DB_PATH = os.path.join(PROJECT_ROOT, "insights.db")
 CHROMA_PATH = os.path.join(PROJECT_ROOT, "chroma_db")
 
+# Insights fetched from ChromaDB (and committed to SQLite) per batch
+CHROMA_BATCH_SIZE = 1000
+# Batches fetched ahead of the SQLite writer
+CHROMA_PREFETCH_BATCHES = 4
+
+_HAS_DIGIT = re.compile(r'\d').search
+
 print("🚀 Starting ChromaDB → SQLite migration...")
 print(f"📁 ChromaDB: {CHROMA_PATH}")
 print(f"📁 SQLite: {DB_PATH}")
@@ -42,7 +53,7 @@ def estimate_quality_score(text: str, metadata: Dict) -> float:
         score += 0.1
     
     # Has numbers/data
-    if any(char.isdigit() for char in text):
+    if _HAS_DIGIT(text):
         score += 0.1
     
     # Has source
@@ -56,17 +67,67 @@ def estimate_quality_score(text: str, metadata: Dict) -> float:
     
     return min(score, 1.0)
 
+# ChromaDB category (lowercased) -> feed category
+CATEGORY_MAP = {
+    'key_insights': 'INSIGHT',
+    'case_study': 'CASE STUDY',
+    'playbook': 'PLAYBOOK',
+    'trends': 'TREND',
+    'counterintuitive': 'COUNTERINTUITIVE',
+    'opportunity': 'OPPORTUNITY',
+}
+
 def normalize_category(category: str) -> str:
     """Normalize category names"""
-    mapping = {
-        'key_insights': 'INSIGHT',
-        'case_study': 'CASE STUDY',
-        'playbook': 'PLAYBOOK',
-        'trends': 'TREND',
-        'counterintuitive': 'COUNTERINTUITIVE',
-        'opportunity': 'OPPORTUNITY',
-    }
-    return mapping.get(category.lower(), category.upper())
+    normalized = CATEGORY_MAP.get(category.lower())
+    return normalized if normalized is not None else category.upper()
+
+def prefetch_chroma_batches(collection, ids):
+    """
+    Yield ChromaDB pages for `ids`, CHROMA_BATCH_SIZE insights at a time.
+
+    A background thread fetches ahead into a bounded queue so ChromaDB reads
+    overlap with the caller's SQLite writes.
+    """
+    batches = queue.Queue(maxsize=CHROMA_PREFETCH_BATCHES)
+    stop = threading.Event()
+    done = object()
+    
+    def put(item):
+        # Give up if the consumer has gone away instead of blocking forever
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def produce():
+        try:
+            for start in range(0, len(ids), CHROMA_BATCH_SIZE):
+                if stop.is_set():
+                    break
+                put(collection.get(
+                    ids=ids[start:start + CHROMA_BATCH_SIZE],
+                    include=['metadatas', 'documents']
+                ))
+        except Exception as e:
+            put(e)
+        put(done)
+    
+    producer = threading.Thread(target=produce, name="chroma-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = batches.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
 
 def migrate_chromadb_insights():
     """Export insights from ChromaDB and import to SQLite"""
@@ -79,112 +140,129 @@ def migrate_chromadb_insights():
     print(f"✅ Found {total_count} insights in ChromaDB")
     print()
     
-    # Get all insights (ChromaDB limits to 10k per query, batch if needed)
-    print("📥 Fetching insights from ChromaDB...")
-    results = collection.get(
-        include=['metadatas', 'documents']
-    )
-    
-    chroma_ids = results['ids']
-    metadatas = results['metadatas']
-    documents = results['documents']
-    
-    print(f"✅ Fetched {len(chroma_ids)} insights")
-    print()
-    
     # Connect to SQLite
     print("🔗 Connecting to SQLite...")
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = apply_pragmas(sqlite3.connect(DB_PATH))
     cursor = conn.cursor()
     
     # Stats
     inserted = 0
     skipped = 0
+    fetched = 0
     topics_found = set()
     
     print("📦 Migrating insights...")
-    for i, chroma_id in enumerate(chroma_ids):
-        if i % 100 == 0 and i > 0:
-            print(f"  Progress: {i}/{len(chroma_ids)} ({(i/len(chroma_ids)*100):.1f}%)")
-        
-        metadata = metadatas[i]
-        text = metadata.get('text', documents[i] if documents else '')
-        
-        # Skip if no text
-        if not text or len(text) < 20:
+    
+    # Diff ChromaDB ids (no metadata) against ids already synced, so only
+    # new insights have their metadata and documents fetched. Synced rows
+    # keep the topic they were migrated with. ON CONFLICT below still guards
+    # the insert.
+    cursor.execute("SELECT chroma_id, topic FROM insights WHERE chroma_id IS NOT NULL")
+    existing = dict(cursor.fetchall())
+    missing_ids = []
+    for chroma_id in collection.get(include=[])['ids']:
+        if chroma_id in existing:
+            topics_found.add(existing[chroma_id])
             skipped += 1
-            continue
-        
-        # Extract fields
-        topic = metadata.get('topic', 'General')
-        category = normalize_category(metadata.get('category', 'INSIGHT'))
-        source_url = metadata.get('source_url', '')
-        source_domain = metadata.get('source_domain', '')
-        
-        # Track topics
-        topics_found.add(topic)
-        
-        # Generate scores
-        quality_score = metadata.get('quality_score', estimate_quality_score(text, metadata))
-        engagement_score = 0.0  # Will be calculated from actual engagement
-        
-        # Timestamps
-        created_at = metadata.get('extracted_at', datetime.now().isoformat())
-        
-        # Generate new UUID for unified feed
-        insight_id = str(uuid.uuid4())
-        
-        # Insert into SQLite
-        try:
-            cursor.execute("""
+            fetched += 1
+        else:
+            missing_ids.append(chroma_id)
+    
+    # Page through the new ids (next page fetched while this one is written)
+    # so only a few batches are held in memory; secondary indexes on insights
+    # are rebuilt once after the last batch
+    with deferred_indexes(conn, "insights"):
+        for results in prefetch_chroma_batches(collection, missing_ids):
+            chroma_ids = results['ids']
+            metadatas = results['metadatas']
+            documents = results['documents']
+            fetched += len(chroma_ids)
+            rows = []
+            
+            for i, chroma_id in enumerate(chroma_ids):
+                metadata = metadatas[i]
+                text = metadata.get('text', documents[i] if documents else '')
+                
+                # Skip if no text
+                if not text or len(text) < 20:
+                    skipped += 1
+                    continue
+                
+                # Extract fields
+                topic = metadata.get('topic', 'General')
+                category = normalize_category(metadata.get('category', 'INSIGHT'))
+                source_url = metadata.get('source_url', '')
+                source_domain = metadata.get('source_domain', '')
+                
+                # Track topics
+                topics_found.add(topic)
+                
+                # Generate scores
+                # Only estimate when the metadata has no score of its own
+                if 'quality_score' in metadata:
+                    quality_score = metadata['quality_score']
+                else:
+                    quality_score = estimate_quality_score(text, metadata)
+                engagement_score = 0.0  # Will be calculated from actual engagement
+                
+                # Timestamps (missing ones are filled in by SQLite, see below)
+                created_at = metadata.get('extracted_at')
+                
+                rows.append((
+                    topic,
+                    category,
+                    text,
+                    source_url,
+                    source_domain,
+                    quality_score,
+                    engagement_score,
+                    created_at,
+                    chroma_id  # Store ChromaDB ID for reference
+                ))
+            
+            # Insert into SQLite: one prepared statement and one transaction per
+            # batch; rows already synced are skipped by the chroma_id unique
+            # index (migration 014). New UUIDs for the unified feed and missing
+            # created_at (local time, ISO format) are generated by SQLite.
+            cursor.execute("BEGIN")
+            cursor.executemany(f"""
                 INSERT INTO insights (
                     id, topic, category, text, source_url, source_domain,
                     quality_score, engagement_score, created_at,
                     chroma_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                insight_id,
-                topic,
-                category,
-                text,
-                source_url,
-                source_domain,
-                quality_score,
-                engagement_score,
-                created_at,
-                chroma_id  # Store ChromaDB ID for reference
-            ))
-            inserted += 1
-        except sqlite3.IntegrityError:
-            skipped += 1
-            continue
+                ) VALUES (
+                    {UUID4_SQL}, ?, ?, ?, ?, ?, ?, ?,
+                    COALESCE(?, strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')), ?
+                )
+                ON CONFLICT(chroma_id) DO NOTHING
+            """, rows)
+            inserted += cursor.rowcount
+            skipped += len(rows) - cursor.rowcount
+            conn.commit()
+            
+            print(f"  Progress: {fetched}/{total_count} ({(fetched/max(total_count, 1)*100):.1f}%)")
     
-    # Commit insights
-    conn.commit()
     print(f"✅ Migrated {inserted} insights ({skipped} skipped)")
     print()
     
     # Create topics metadata
     print("📚 Creating topic metadata...")
-    for topic in topics_found:
-        # Count insights per topic
-        cursor.execute("""
-            SELECT COUNT(*) as count, AVG(quality_score) as avg_quality
-            FROM insights
-            WHERE topic = ? AND is_archived = 0
-        """, (topic,))
-        row = cursor.fetchone()
-        
-        cursor.execute("""
-            INSERT OR IGNORE INTO topics (
-                topic, insight_count, updated_at
-            ) VALUES (?, ?, ?)
-        """, (
-            topic,
-            row[0],  # count
-            datetime.now().isoformat()
-        ))
+    # Count insights for every topic in one pass
+    cursor.execute("""
+        SELECT topic, COUNT(*) as count
+        FROM insights
+        WHERE is_archived = 0
+        GROUP BY topic
+    """)
+    topic_counts = dict(cursor.fetchall())
+    
+    updated_at = datetime.now().isoformat()
+    cursor.execute("BEGIN")
+    cursor.executemany("""
+        INSERT OR IGNORE INTO topics (
+            topic, insight_count, updated_at
+        ) VALUES (?, ?, ?)
+    """, [(topic, topic_counts.get(topic, 0), updated_at) for topic in topics_found])
     
     conn.commit()
     print(f"✅ Created metadata for {len(topics_found)} topics")
@@ -200,10 +278,17 @@ def migrate_chromadb_insights():
         cursor.execute("SELECT * FROM user_interests")
         old_interests = cursor.fetchall()
         
+        # Plain tuple rows; resolve column positions once (created_at is optional)
+        columns = [col[0] for col in cursor.description]
+        topic_idx = columns.index('topic')
+        created_at_idx = columns.index('created_at') if 'created_at' in columns else None
+        followed_at_default = datetime.now().isoformat()
+        
+        cursor.execute("BEGIN")
         for interest in old_interests:
             user_id = 'default'  # Single user for now
-            topic = interest['topic']
-            created_at = interest['created_at'] if 'created_at' in interest.keys() else datetime.now().isoformat()
+            topic = interest[topic_idx]
+            created_at = interest[created_at_idx] if created_at_idx is not None else followed_at_default
             
             cursor.execute("""
                 INSERT OR IGNORE INTO user_topics (
@@ -218,8 +303,6 @@ def migrate_chromadb_insights():
     print()
     
     # Summary
-    conn.close()
-    
     print("=" * 60)
     print("MIGRATION SUMMARY")
     print("=" * 60)
@@ -229,9 +312,7 @@ def migrate_chromadb_insights():
     print()
     print("Top topics:")
     
-    # Reconnect to show stats
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    # Stats from the same connection (keeps its warm page cache)
     cursor.execute("""
         SELECT topic, COUNT(*) as count
         FROM insights
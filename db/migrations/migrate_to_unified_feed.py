@@ -12,17 +12,41 @@ This script:
 import sqlite3
 import json
 import os
+import re
 import sys
 from datetime import datetime
-import uuid
+from functools import lru_cache, partial
+from urllib.parse import urlparse
 
 # Add project root to path
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
+from backend.utils.database import UUID4_SQL, apply_pragmas, deferred_indexes
+
 DB_PATH = os.path.join(PROJECT_ROOT, "insights.db")
 MIGRATION_SQL = os.path.join(PROJECT_ROOT, "db", "migrations", "001_unified_feed.sql")
 
+# Category keywords in priority order (first matching category wins)
+CATEGORY_KEYWORDS = [
+    ('CASE STUDY', ['case study', 'example', 'company', 'startup']),
+    ('PLAYBOOK', ['how to', 'playbook', 'framework', 'strategy']),
+    ('TREND', ['metric', 'benchmark', 'data', 'number', 'stat']),
+    ('COUNTERINTUITIVE', ['surprising', 'unexpected', 'counterintuitive', 'paradox']),
+    ('OPPORTUNITY', ['opportunity', 'gap', 'untapped', 'potential']),
+]
+
+# keyword -> priority rank; one zero-width alternation finds every
+# (possibly overlapping) keyword occurrence in a single scan
+_KEYWORD_RANK = {
+    word: rank
+    for rank, (_, words) in enumerate(CATEGORY_KEYWORDS)
+    for word in words
+}
+_KEYWORD_RE = re.compile('(?=(' + '|'.join(map(re.escape, _KEYWORD_RANK)) + '))')
+
+_HAS_DIGIT = re.compile(r'\d').search
+
 
 def run_migration_sql(conn):
     """Execute the migration SQL file"""
@@ -48,89 +72,52 @@ def migrate_insights(conn):
     
     # Get all insights with their agent info
     cursor.execute("""
-        SELECT 
-            i.id,
-            i.agent_id,
-            a.topic,
-            i.url,
-            i.source_name,
-            i.extracted_data,
-            i.date_crawled
+        SELECT COUNT(*)
         FROM insights_v2 i
-        LEFT JOIN agents a ON i.agent_id = a.id
+        JOIN agents a ON i.agent_id = a.id
         WHERE a.topic IS NOT NULL
     """)
-    
-    old_insights = cursor.fetchall()
-    print(f"Found {len(old_insights)} insights to migrate")
-    
-    migrated = 0
-    skipped = 0
-    
-    for row in old_insights:
-        legacy_id = row[0]
-        legacy_agent_id = row[1]
-        topic = row[2]
-        source_url = row[3]
-        source_name = row[4]
-        extracted_data_json = row[5]
-        date_crawled = row[6]
-        
-        # Parse extracted data
-        try:
-            extracted_data = json.loads(extracted_data_json)
-        except:
-            print(f"⚠️  Skipping insight {legacy_id}: Invalid JSON")
-            skipped += 1
-            continue
-        
-        # Generate insight text from extracted data
-        insight_text = generate_insight_text(extracted_data)
-        if not insight_text or len(insight_text) < 20:
-            print(f"⚠️  Skipping insight {legacy_id}: No valid text")
-            skipped += 1
-            continue
-        
-        # Categorize insight
-        category = categorize_insight(extracted_data)
-        
-        # Extract domain from URL
-        source_domain = extract_domain(source_url)
-        
-        # Generate quality score (placeholder - will be improved)
-        quality_score = estimate_quality_score(insight_text, extracted_data)
-        
-        # Generate UUID for new insight
-        insight_id = str(uuid.uuid4())
+    total = cursor.fetchone()[0]
+    print(f"Found {total} insights to migrate")
+    
+    # Only the fields derived from the extracted_data JSON need Python; they
+    # are exposed as SQL functions so the copy runs as one INSERT ... SELECT
+    register_insight_functions(conn)
+    
+    # One statement and one transaction (and journal sync) for the pass;
+    # OR IGNORE skips conflicting rows instead of aborting the load.
+    # Secondary indexes are rebuilt once after the load.
+    with deferred_indexes(conn, "insights"):
+        cursor.execute("BEGIN")
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO insights (
+                id, topic, category, text, source_url, source_domain,
+                quality_score, engagement_score, created_at,
+                legacy_insight_id, legacy_agent_id
+            )
+            SELECT
+                {UUID4_SQL},
+                a.topic,
+                insight_category(i.extracted_data),
+                insight_text(i.extracted_data),
+                i.url,
+                url_domain(i.url),
+                insight_quality(i.extracted_data),
+                0.0,  -- Default engagement score
+                i.date_crawled,
+                i.id,
+                i.agent_id
+            FROM insights_v2 i
+            JOIN agents a ON i.agent_id = a.id
+            WHERE a.topic IS NOT NULL
+              AND insight_text(i.extracted_data) IS NOT NULL  -- Invalid JSON or no valid text
+        """)
+        migrated = cursor.rowcount
+        skipped = total - migrated
         
-        # Insert into new insights table
-        try:
-            cursor.execute("""
-                INSERT INTO insights (
-                    id, topic, category, text, source_url, source_domain,
-                    quality_score, engagement_score, created_at,
-                    legacy_insight_id, legacy_agent_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                insight_id,
-                topic,
-                category,
-                insight_text,
-                source_url,
-                source_domain,
-                quality_score,
-                0.0,  # Default engagement score
-                date_crawled,
-                legacy_id,
-                legacy_agent_id
-            ))
-            migrated += 1
-        except Exception as e:
-            print(f"⚠️  Error migrating insight {legacy_id}: {e}")
-            skipped += 1
-            continue
+        conn.commit()
     
-    conn.commit()
+    _insight_fields.cache_clear()
     print(f"✅ Migrated {migrated} insights ({skipped} skipped)")
 
 
@@ -154,6 +141,7 @@ def migrate_user_interests(conn):
     print(f"Found {len(interests)} user interests")
     
     # Insert into user_topics (use 'default' as user_id for MVP)
+    cursor.execute("BEGIN")
     for row in interests:
         topic = row[0]
         created_at = row[1]
@@ -217,7 +205,17 @@ def migrate_engagement(conn):
     old_engagements = cursor.fetchall()
     print(f"Found {len(old_engagements)} engagement records")
     
+    # legacy_insight_id -> new id in one query instead of one per engagement
+    # (DESC so the lowest rowid wins on re-runs, as the per-row lookup did)
+    cursor.execute("""
+        SELECT legacy_insight_id, id FROM insights
+        WHERE legacy_insight_id IS NOT NULL
+        ORDER BY rowid DESC
+    """)
+    id_map = dict(cursor.fetchall())
+    
     migrated = 0
+    rows = []
     
     for row in old_engagements:
         legacy_id = row[0]
@@ -227,16 +225,10 @@ def migrate_engagement(conn):
         engaged_at = row[4]
         
         # Find new insight ID
-        cursor.execute("""
-            SELECT id FROM insights WHERE legacy_insight_id = ?
-        """, (legacy_insight_id,))
-        
-        result = cursor.fetchone()
-        if not result:
+        new_insight_id = id_map.get(legacy_insight_id)
+        if new_insight_id is None:
             continue  # Insight wasn't migrated
         
-        new_insight_id = result[0]
-        
         # Map action names if needed
         if action == 'skip':
             action = 'dismiss'
@@ -245,19 +237,19 @@ def migrate_engagement(conn):
         # (We'll assume engagement means they viewed it)
         if action in ['like', 'bookmark', 'dismiss']:
             # Insert view action first
-            cursor.execute("""
-                INSERT OR IGNORE INTO user_engagement (id, user_id, insight_id, action, created_at)
-                VALUES (?, ?, ?, 'view', ?)
-            """, (str(uuid.uuid4()), f"user_{user_id}", new_insight_id, engaged_at))
+            rows.append((f"user_{user_id}", new_insight_id, 'view', engaged_at))
         
         # Insert the actual engagement
-        cursor.execute("""
-            INSERT OR IGNORE INTO user_engagement (id, user_id, insight_id, action, created_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (str(uuid.uuid4()), f"user_{user_id}", new_insight_id, action, engaged_at))
+        rows.append((f"user_{user_id}", new_insight_id, action, engaged_at))
         
         migrated += 1
     
+    cursor.execute("BEGIN")
+    cursor.executemany("""
+        INSERT OR IGNORE INTO user_engagement (user_id, insight_id, action, created_at)
+        VALUES (?, ?, ?, ?)
+    """, rows)
+    
     conn.commit()
     print(f"✅ Migrated {migrated} engagement records")
 
@@ -282,21 +274,18 @@ def create_topic_metadata(conn):
     
     topics = cursor.fetchall()
     
-    for row in topics:
-        topic = row[0]
-        insight_count = row[1]
-        
-        # Count followers
-        cursor.execute("""
-            SELECT COUNT(*) FROM user_topics WHERE topic = ?
-        """, (topic,))
-        follower_count = cursor.fetchone()[0]
-        
-        # Insert or update topic
-        cursor.execute("""
-            INSERT OR REPLACE INTO topics (topic, insight_count, follower_count)
-            VALUES (?, ?, ?)
-        """, (topic, insight_count, follower_count))
+    # Count followers for every topic in one pass
+    cursor.execute("""
+        SELECT topic, COUNT(*) FROM user_topics GROUP BY topic
+    """)
+    follower_counts = dict(cursor.fetchall())
+    
+    # Insert or update topics
+    cursor.execute("BEGIN")
+    cursor.executemany("""
+        INSERT OR REPLACE INTO topics (topic, insight_count, follower_count)
+        VALUES (?, ?, ?)
+    """, [(topic, insight_count, follower_counts.get(topic, 0)) for topic, insight_count in topics])
     
     conn.commit()
     print(f"✅ Created metadata for {len(topics)} topics")
@@ -310,42 +299,29 @@ def calculate_engagement_scores(conn):
     
     cursor = conn.cursor()
     
-    # Get insights with engagement data
+    # Engagement score = (likes + saves) / views, capped at 1.0, for every
+    # viewed insight in one set-based UPDATE
+    cursor.execute("BEGIN")
     cursor.execute("""
-        SELECT 
-            i.id,
-            COUNT(DISTINCT CASE WHEN e.action = 'view' THEN e.user_id END) as views,
-            COUNT(DISTINCT CASE WHEN e.action = 'like' THEN e.user_id END) as likes,
-            COUNT(DISTINCT CASE WHEN e.action = 'save' THEN e.user_id END) as saves
-        FROM insights i
-        LEFT JOIN user_engagement e ON i.id = e.insight_id
-        GROUP BY i.id
-        HAVING views > 0
+        UPDATE insights
+        SET engagement_score = MIN((e.likes + e.saves) * 1.0 / e.views, 1.0),
+            updated_at = CURRENT_TIMESTAMP
+        FROM (
+            SELECT
+                insight_id,
+                COUNT(DISTINCT CASE WHEN action = 'view' THEN user_id END) as views,
+                COUNT(DISTINCT CASE WHEN action = 'like' THEN user_id END) as likes,
+                COUNT(DISTINCT CASE WHEN action = 'save' THEN user_id END) as saves
+            FROM user_engagement
+            GROUP BY insight_id
+            HAVING views > 0
+        ) AS e
+        WHERE insights.id = e.insight_id
     """)
-    
-    insights = cursor.fetchall()
-    
-    for row in insights:
-        insight_id = row[0]
-        views = row[1]
-        likes = row[2]
-        saves = row[3]
-        
-        # Calculate engagement score: (likes + saves) / views
-        if views > 0:
-            engagement_score = min((likes + saves) / views, 1.0)
-        else:
-            engagement_score = 0.0
-        
-        # Update insight
-        cursor.execute("""
-            UPDATE insights 
-            SET engagement_score = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (engagement_score, insight_id))
+    updated = cursor.rowcount
     
     conn.commit()
-    print(f"✅ Calculated engagement scores for {len(insights)} insights")
+    print(f"✅ Calculated engagement scores for {updated} insights")
 
 
 # ============================================================================
@@ -354,48 +330,92 @@ def calculate_engagement_scores(conn):
 
 def generate_insight_text(extracted_data: dict) -> str:
     """Generate full insight text from extracted data"""
-    # Try to find the main text field
-    for field_name, values in extracted_data.items():
-        if isinstance(values, list) and len(values) > 0:
-            if isinstance(values[0], str) and len(values[0]) > 20:
-                return values[0]
-    
-    # Fallback: concatenate all text
+    # Main text is the first field whose leading value is substantial;
+    # otherwise concatenate all text, gathered in the same pass
     all_text = []
-    for field_name, values in extracted_data.items():
-        if isinstance(values, list):
-            for value in values:
-                if isinstance(value, str) and len(value) > 10:
-                    all_text.append(value)
+    for values in extracted_data.values():
+        if not isinstance(values, list) or not values:
+            continue
+        
+        if isinstance(values[0], str) and len(values[0]) > 20:
+            return values[0]
+        
+        all_text.extend(value for value in values if isinstance(value, str) and len(value) > 10)
     
-    return "\n\n".join(all_text) if all_text else ""
+    return "\n\n".join(all_text)
+
+
+@lru_cache(maxsize=1)
+def _insight_fields(extracted_data_json: str):
+    """
+    (text, category, quality_score) for a legacy extracted_data blob, or
+    None if the JSON is invalid or yields no valid text.
+
+    The SQL functions below each ask for one field of the same row in turn,
+    so a one-entry cache parses every blob once.
+    """
+    try:
+        extracted_data = json.loads(extracted_data_json)
+    except (TypeError, ValueError):
+        return None
+    
+    insight_text = generate_insight_text(extracted_data)
+    if not insight_text or len(insight_text) < 20:
+        return None
+    
+    return (
+        insight_text,
+        categorize_insight(extracted_data),
+        estimate_quality_score(insight_text, extracted_data),
+    )
+
+
+def _insight_field(index: int, extracted_data_json: str):
+    fields = _insight_fields(extracted_data_json)
+    return fields[index] if fields else None
+
+
+def register_insight_functions(conn):
+    """Expose the insight derivation helpers as SQL functions on conn"""
+    for name, index in (("insight_text", 0), ("insight_category", 1), ("insight_quality", 2)):
+        conn.create_function(name, 1, partial(_insight_field, index), deterministic=True)
+    conn.create_function("url_domain", 1, extract_domain, deterministic=True)
+
+
+def _iter_strings(value):
+    """Yield every string (dict keys included) in parsed JSON data."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield from _iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_strings(item)
 
 
 def categorize_insight(extracted_data: dict) -> str:
     """Categorize insight based on content"""
-    data_str = json.dumps(extracted_data).lower()
-    
-    if any(word in data_str for word in ['case study', 'example', 'company', 'startup']):
-        return 'CASE STUDY'
-    elif any(word in data_str for word in ['how to', 'playbook', 'framework', 'strategy']):
-        return 'PLAYBOOK'
-    elif any(word in data_str for word in ['metric', 'benchmark', 'data', 'number', 'stat']):
-        return 'TREND'
-    elif any(word in data_str for word in ['surprising', 'unexpected', 'counterintuitive', 'paradox']):
-        return 'COUNTERINTUITIVE'
-    elif any(word in data_str for word in ['opportunity', 'gap', 'untapped', 'potential']):
-        return 'OPPORTUNITY'
-    else:
-        return 'INSIGHT'
+    # Scan the field names and values in place rather than a lowered
+    # json.dumps copy of the whole structure
+    best = len(CATEGORY_KEYWORDS)
+    for text in _iter_strings(extracted_data):
+        for match in _KEYWORD_RE.finditer(text.lower()):
+            best = min(best, _KEYWORD_RANK[match.group(1)])
+            if best == 0:
+                return CATEGORY_KEYWORDS[0][0]
+    
+    return CATEGORY_KEYWORDS[best][0] if best < len(CATEGORY_KEYWORDS) else 'INSIGHT'
 
 
+@lru_cache(maxsize=4096)
 def extract_domain(url: str) -> str:
-    """Extract domain from URL"""
+    """Extract domain from URL (cached: many insights share a source)"""
     if not url:
         return ""
     
     try:
-        from urllib.parse import urlparse
         parsed = urlparse(url)
         domain = parsed.netloc
         # Remove www.
@@ -418,7 +438,7 @@ def estimate_quality_score(text: str, extracted_data: dict) -> float:
         score -= 2.0
     
     # Specificity bonus (numbers, names, examples)
-    if any(char.isdigit() for char in text):
+    if _HAS_DIGIT(text):
         score += 1.0
     
     if text.count('.') >= 2:  # Multiple sentences
@@ -487,7 +507,7 @@ def main():
         print("❌ Database not found! Run init_db.py first.")
         return
     
-    conn = sqlite3.connect(DB_PATH)
+    conn = apply_pragmas(sqlite3.connect(DB_PATH))
     
     try:
         # Step 1: Run migration SQL
@@ -69,8 +69,16 @@ def verify_migration(conn):
 
     cursor = conn.cursor()
 
+    # Table and its indexes in one sqlite_master read
+    cursor.execute(
+        "SELECT type, name FROM sqlite_master WHERE tbl_name = ?",
+        ("extraction_jobs",)
+    )
+    schema_objects = cursor.fetchall()
+    indexes = {name for obj_type, name in schema_objects if obj_type == 'index'}
+
     # Check table exists
-    if not check_table_exists(conn, "extraction_jobs"):
+    if ('table', 'extraction_jobs') not in schema_objects:
         print("❌ extraction_jobs table not found!")
         return False
 
@@ -96,11 +104,8 @@ def verify_migration(conn):
     print(f"✅ All {len(columns)} columns present")
 
     # Check indexes
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='extraction_jobs'")
-    indexes = [row[0] for row in cursor.fetchall()]
-
     expected_indexes = [
-        'idx_extraction_jobs_topic',
+        'idx_extraction_jobs_topic_created',
         'idx_extraction_jobs_status',
         'idx_extraction_jobs_user_id',
         'idx_extraction_jobs_priority',
@@ -150,6 +155,10 @@ def main():
             print("\n❌ Migration verification failed!")
             sys.exit(1)
 
+        # Give the planner statistics for the new table and indexes
+        conn.execute("ANALYZE extraction_jobs")
+        conn.execute("PRAGMA optimize")
+
         print("\n" + "=" * 70)
         print("✅ Migration 002 completed successfully!")
         print("=" * 70)
@@ -5,6 +5,7 @@ This script tests basic CRUD operations on the extraction_jobs table.
 
 Usage:
     python db/migrations/test_002_migration.py
+    python db/migrations/test_002_migration.py --memory  # no insights.db needed
 """
 
 import sqlite3
@@ -17,7 +18,10 @@ from datetime import datetime, timedelta
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
+from backend.utils.database import apply_pragmas
+
 DB_PATH = os.path.join(PROJECT_ROOT, "insights.db")
+MIGRATION_SQL = os.path.join(os.path.dirname(__file__), "002_extraction_jobs.sql")
 
 
 def test_insert_job(conn):
@@ -25,8 +29,9 @@ def test_insert_job(conn):
     print("\n📝 Test 1: Insert job...")
 
     job_id = str(uuid.uuid4())
-    now = datetime.utcnow().isoformat()
-    estimated = (datetime.utcnow() + timedelta(minutes=5)).isoformat()
+    started = datetime.utcnow()
+    now = started.isoformat()
+    estimated = (started + timedelta(minutes=5)).isoformat()
 
     cursor = conn.cursor()
     cursor.execute("""
@@ -186,21 +191,35 @@ def test_cleanup(conn):
     print(f"✅ Deleted {deleted} test records")
 
 
+def _prepare_test_db():
+    """In-memory database with the migration applied (no WAL, no fsync)"""
+    conn = sqlite3.connect(":memory:")
+    with open(MIGRATION_SQL, 'r') as f:
+        conn.executescript(f.read())
+    return conn
+
+
 def main():
     """Run all tests"""
+    in_memory = "--memory" in sys.argv[1:]
+
     print("=" * 70)
     print("Testing Migration 002: extraction_jobs table")
     print("=" * 70)
-    print(f"Database: {DB_PATH}")
+    print(f"Database: {':memory: (' + MIGRATION_SQL + ')' if in_memory else DB_PATH}")
     print()
 
-    if not os.path.exists(DB_PATH):
+    if not in_memory and not os.path.exists(DB_PATH):
         print(f"❌ Database not found: {DB_PATH}")
         print("   Run the migration first: python db/migrations/run_002_extraction_jobs.py")
         sys.exit(1)
 
+    conn = None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        if in_memory:
+            conn = _prepare_test_db()
+        else:
+            conn = apply_pragmas(sqlite3.connect(DB_PATH))
 
         # Run tests
         job_id = test_insert_job(conn)
@@ -1,10 +1,15 @@
 """Reset both SQLite insights and ChromaDB to start fresh"""
 import sqlite3
 import os
+import sys
 import chromadb
 from chromadb.config import Settings
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.utils.database import apply_pragmas
+
 DB_PATH = os.path.join(PROJECT_ROOT, "insights.db")
 CHROMA_PATH = os.path.join(PROJECT_ROOT, "chroma_db")
 
@@ -18,20 +23,42 @@ def reset_databases():
 
     # 1. Clear SQLite insights table
     print("1. Clearing SQLite insights table...")
-    conn = sqlite3.connect(DB_PATH)
+    conn = apply_pragmas(sqlite3.connect(DB_PATH))
     cursor = conn.cursor()
 
     # Get count before deletion
     cursor.execute("SELECT COUNT(*) FROM insights")
     before_count = cursor.fetchone()[0]
 
-    # Delete all insights
-    cursor.execute("DELETE FROM insights")
+    # Drop and recreate the table instead of deleting row by row: the
+    # per-row delete trigger and index maintenance make DELETE slow on a
+    # large table. The DDL (table, indexes, triggers) is read back from
+    # sqlite_master, so it matches whatever migrations have been applied.
+    cursor.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE tbl_name = 'insights' AND sql IS NOT NULL
+        ORDER BY type != 'table'
+    """)
+    schema = [row[0] for row in cursor.fetchall()]
+
+    cursor.execute("BEGIN")
+    cursor.execute("DROP TABLE insights")
+    for statement in schema:
+        cursor.execute(statement)
+    # Rows derived from insights that the delete trigger used to clear
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'insight_feed_mv'
+    """)
+    if cursor.fetchone():
+        cursor.execute("DELETE FROM insight_feed_mv")
     conn.commit()
 
-    # Reset autoincrement
-    cursor.execute("DELETE FROM sqlite_sequence WHERE name='insights'")
-    conn.commit()
+    # Statistics still describe the old rows; re-gather them for the empty table
+    cursor.execute("ANALYZE insights")
+    cursor.execute("PRAGMA optimize")
+
+    # Return the freed pages to the filesystem
+    cursor.execute("VACUUM")
     conn.close()
 
     print(f"   Deleted {before_count} insights from SQLite")
@@ -126,8 +153,6 @@ def show_status():
 
 
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) > 1 and sys.argv[1] == "status":
         show_status()
     else:
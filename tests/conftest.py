@@ -10,11 +10,10 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 
 
-@pytest.fixture
-def test_db() -> Generator[sqlite3.Connection, None, None]:
-    """Create in-memory test database with schema."""
+@pytest.fixture(scope="session")
+def _schema_template() -> Generator[sqlite3.Connection, None, None]:
+    """Build the test schema once per session (copied into each test_db)."""
     conn = sqlite3.connect(":memory:")
-    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
     cursor.executescript("""
@@ -59,6 +58,18 @@ def test_db() -> Generator[sqlite3.Connection, None, None]:
     conn.close()
 
 
+@pytest.fixture
+def test_db(_schema_template: sqlite3.Connection) -> Generator[sqlite3.Connection, None, None]:
+    """Create in-memory test database with schema."""
+    conn = sqlite3.connect(":memory:")
+    # Page-level copy of the template, no DDL re-parsing per test
+    _schema_template.backup(conn)
+    conn.row_factory = sqlite3.Row
+
+    yield conn
+    conn.close()
+
+
 @pytest.fixture
 def sample_insights(test_db: sqlite3.Connection) -> list:
     """Insert sample insights for testing."""
@@ -74,12 +85,11 @@ def sample_insights(test_db: sqlite3.Connection) -> list:
     ]
 
     cursor = test_db.cursor()
-    for insight in insights:
-        cursor.execute("""
-            INSERT INTO insights
-            (id, topic, category, text, source_url, source_domain, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, insight)
+    cursor.executemany("""
+        INSERT INTO insights
+        (id, topic, category, text, source_url, source_domain, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, insights)
 
     test_db.commit()
     return insights
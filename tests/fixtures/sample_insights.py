@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-SAMPLE_INSIGHTS = [
+SAMPLE_INSIGHTS = (
     {
         "id": "insight-1",
         "topic": "AI agents",
@@ -57,11 +57,13 @@ SAMPLE_INSIGHTS = [
         "quality_score": 0.70,
         "engagement_score": 0.0,
         "created_at": "2024-01-05T10:00:00"
-    }
-]
+    },
+)
 
 def create_insight(topic: str, text: str, **kwargs) -> dict:
     """Helper to create a test insight."""
+    # Only read the clock when no timestamp is given
+    created_at = kwargs["created_at"] if "created_at" in kwargs else datetime.now().isoformat()
     return {
         "id": kwargs.get("id", f"test-{topic.replace(' ', '-')}"),
         "topic": topic,
@@ -71,5 +73,5 @@ def create_insight(topic: str, text: str, **kwargs) -> dict:
         "source_domain": kwargs.get("source_domain", "example.com"),
         "quality_score": kwargs.get("quality_score", 0.75),
         "engagement_score": kwargs.get("engagement_score", 0.0),
-        "created_at": kwargs.get("created_at", datetime.now().isoformat())
+        "created_at": created_at
     }
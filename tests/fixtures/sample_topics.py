@@ -1,6 +1,6 @@
 """Sample topics for testing."""
 
-VALID_TOPICS = [
+VALID_TOPICS = (
     "AI agents",
     "ML",
     "machine learning",
@@ -10,21 +10,21 @@ VALID_TOPICS = [
     "Y Combinator",
     "value investing",
     "Gen Z marketing",
-]
+)
 
-INVALID_TOPICS = [
+INVALID_TOPICS = (
     "x",  # Too short
     "test",  # Banned word
     "asdf jkl",  # Gibberish
     "x" * 51,  # Too long
     "123456",  # All numbers
     "stuff about things",  # Vague
-]
+)
 
-EDGE_CASE_TOPICS = [
+EDGE_CASE_TOPICS = (
     "AI",  # Valid acronym
     "ML models",  # Acronym with context
     "B2B SaaS",  # Multiple acronyms
     "Y-Combinator",  # Hyphenated
     "Web3 & DeFi",  # With ampersand
-]
+)
@@ -206,11 +206,10 @@ def simulate_engagement():
     for insight_id in insight_ids:
         # Random actions
         for action in random.sample(actions, random.randint(1, 3)):
-            engagement_id = str(uuid.uuid4())
             cursor.execute("""
-                INSERT OR IGNORE INTO user_engagement (id, user_id, insight_id, action, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (engagement_id, test_user_id, insight_id, action, datetime.now().isoformat()))
+                INSERT OR IGNORE INTO user_engagement (user_id, insight_id, action, created_at)
+                VALUES (?, ?, ?, ?)
+            """, (test_user_id, insight_id, action, datetime.now().isoformat()))
     
     conn.commit()
     
@@ -0,0 +1,529 @@
+"""Test suite for unified feed service."""
+
+import glob
+import os
+import shutil
+import sqlite3
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.services.feed_service import FeedService, InsightScorer
+from backend.services.personalized_scorer import PersonalizedScorer
+from backend.services.user_profile_service import UserProfileService
+from backend.utils.database import release_connection
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+MIGRATIONS_DIR = os.path.join(PROJECT_ROOT, "db", "migrations")
+
+
+@pytest.fixture
+def feed_db(tmp_path) -> str:
+    """Create a file-backed database with all SQL migrations applied."""
+    db_path = str(tmp_path / "feed.db")
+    conn = sqlite3.connect(db_path)
+    for migration in sorted(glob.glob(os.path.join(MIGRATIONS_DIR, "*.sql"))):
+        with open(migration) as f:
+            conn.executescript(f.read())
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _insert_insight(db_path, insight_id, topic, quality=8.0, days_old=1, **kwargs):
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        INSERT INTO insights
+        (id, topic, category, text, source_url, source_domain,
+         quality_score, engagement_score, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        insight_id,
+        topic,
+        kwargs.get("category", "INSIGHT"),
+        kwargs.get("text", f"Insight text for {insight_id}"),
+        f"https://{insight_id}.example.com/post",
+        kwargs.get("source_domain", f"{insight_id}.example.com"),
+        quality,
+        kwargs.get("engagement_score", 0.0),
+        (datetime.now() - timedelta(days=days_old)).isoformat(),
+    ))
+    conn.commit()
+    conn.close()
+
+
+def _count_engagement(db_path, user_id, action):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute(
+        "SELECT COUNT(*) FROM user_engagement WHERE user_id = ? AND action = ?",
+        (user_id, action)
+    ).fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_following_feed_returns_unseen_followed_topics(feed_db):
+    """Following feed only returns unseen insights from followed topics"""
+    _insert_insight(feed_db, "a1", "AI agents")
+    _insert_insight(feed_db, "a2", "AI agents", days_old=10)
+    _insert_insight(feed_db, "w1", "Web3")
+
+    service = FeedService(feed_db)
+    service.follow_topic("user-1", "AI agents")
+
+    feed = service.generate_following_feed("user-1", limit=10)
+
+    assert [i["id"] for i in feed] == ["a1", "a2"]
+    assert _count_engagement(feed_db, "user-1", "view") == 2
+
+    # Second call should not repeat seen insights
+    assert service.generate_following_feed("user-1", limit=10) == []
+
+
+def test_for_you_feed_marks_viewed(feed_db):
+    """For You feed returns candidates and marks them viewed"""
+    for i in range(5):
+        _insert_insight(feed_db, f"i{i}", f"Topic {i}", quality=6 + i)
+
+    service = FeedService(feed_db)
+    feed, has_more = service.generate_for_you_feed("user-2", limit=3, check_has_more=True)
+
+    assert len(feed) == 3
+    assert has_more is True
+    assert _count_engagement(feed_db, "user-2", "view") == 3
+
+    feed, has_more = service.generate_for_you_feed("user-2", limit=3, check_has_more=True)
+    assert len(feed) == 2
+    assert has_more is False
+
+
+def test_record_engagement_toggles_like(feed_db):
+    """Liking twice toggles the like off and updates engagement score"""
+    _insert_insight(feed_db, "a1", "AI agents")
+    service = FeedService(feed_db)
+
+    service.record_engagement("user-3", "a1", "view")
+    service.record_engagement("user-3", "a1", "like")
+
+    conn = sqlite3.connect(feed_db)
+    score = conn.execute("SELECT engagement_score FROM insights WHERE id = 'a1'").fetchone()[0]
+    conn.close()
+    assert score == pytest.approx(1.0)
+    assert _count_engagement(feed_db, "user-3", "like") == 1
+
+    service.record_engagement("user-3", "a1", "like")
+    assert _count_engagement(feed_db, "user-3", "like") == 0
+
+    conn = sqlite3.connect(feed_db)
+    score = conn.execute("SELECT engagement_score FROM insights WHERE id = 'a1'").fetchone()[0]
+    conn.close()
+    assert score == 0.0
+
+
+def test_pooled_connection_refuses_checkout_mid_transaction(feed_db):
+    """A nested checkout raises instead of discarding the holder's writes"""
+    service = FeedService(feed_db)
+    conn = service.get_db_connection()
+    conn.execute(
+        "INSERT INTO user_topics (user_id, topic, followed_at) VALUES ('user-4', 'AI agents', ?)",
+        (datetime.now().isoformat(),)
+    )
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        UserProfileService(feed_db).update_topic_affinity("user-4", "AI agents", 0.2)
+
+    conn.commit()
+    release_connection(conn)
+    assert service.get_user_topics("user-4") == ["AI agents"]
+
+    # follow_topic hands its cursor to the profile service instead
+    service.follow_topic("user-4", "LLM tooling")
+    assert UserProfileService(feed_db).get_topic_affinities("user-4", apply_decay=False) == {
+        "LLM tooling": pytest.approx(0.70)
+    }
+
+
+def test_calculate_feed_score_uses_passed_last_topic(feed_db):
+    """A pre-fetched last topic applies the same diversity penalty"""
+    _insert_insight(feed_db, "a1", "AI agents")
+    scorer = InsightScorer(feed_db)
+    insight = {
+        "id": "a1", "topic": "AI agents", "category": "INSIGHT",
+        "source_domain": "example.com", "quality_score": 8.0,
+        "engagement_score": 0.0, "created_at": datetime.now().isoformat(),
+    }
+
+    neutral = scorer.calculate_feed_score("user-4", insight, last_topic="Web3")
+    penalized = scorer.calculate_feed_score("user-4", insight, last_topic="AI agents")
+
+    assert neutral - penalized == pytest.approx(0.30)
+
+
+def test_topic_similarity_uses_precomputed_table(feed_db):
+    """Precomputed similarities are looked up symmetrically, word overlap otherwise"""
+    conn = sqlite3.connect(feed_db)
+    conn.execute("""
+        INSERT INTO topic_similarity (topic_a, topic_b, similarity_score)
+        VALUES ('AI agents', 'LLM tooling', 0.8)
+    """)
+    conn.commit()
+    conn.close()
+
+    scorer = InsightScorer(feed_db)
+    assert scorer._sim is None  # loaded on first use
+
+    assert scorer._calculate_topic_similarity("LLM tooling", "AI agents") == pytest.approx(0.8)
+    assert scorer._sim.shape == (2, 2)
+    assert scorer._calculate_topic_similarity("AI agents", "AI safety") == pytest.approx(1 / 3)
+    assert scorer._calculate_topic_similarity("Web3", "Biotech") == 0.0
+
+    # Matrix gather for known pairs, word overlap for the rest
+    max_sim = scorer._max_topic_similarity(["LLM tooling", "AI safety", "Web3"], ["AI agents"])
+    assert max_sim.tolist() == pytest.approx([0.8, 1 / 3, 0.0])
+
+
+def test_topic_similarity_loaded_per_scorer(feed_db, tmp_path):
+    """Each scorer loads its own database's similarity matrix"""
+    other_db = str(tmp_path / "other.db")
+    shutil.copy(feed_db, other_db)
+    conn = sqlite3.connect(other_db)
+    conn.execute("""
+        INSERT INTO topic_similarity (topic_a, topic_b, similarity_score)
+        VALUES ('AI agents', 'LLM tooling', 0.8)
+    """)
+    conn.commit()
+    conn.close()
+
+    scorer = InsightScorer(feed_db)
+    other = InsightScorer(other_db)
+
+    assert other._calculate_topic_similarity("AI agents", "LLM tooling") == pytest.approx(0.8)
+    assert scorer._calculate_topic_similarity("AI agents", "LLM tooling") == 0.0
+    assert scorer._sim.shape == (0, 0)
+    assert other._sim.shape == (2, 2)
+
+
+def test_max_topic_similarity_reduces_per_candidate(feed_db):
+    """Each candidate gets its best similarity across followed topics"""
+    scorer = InsightScorer(feed_db)
+
+    max_sim = scorer._max_topic_similarity(
+        ["AI agents", "Web3", "AI safety"],
+        ["AI agents", "Biotech"],
+    )
+    assert max_sim.tolist() == pytest.approx([1.0, 0.0, 1 / 3])
+    assert scorer._max_topic_similarity(["AI agents"], []).tolist() == [0.0]
+
+
+def test_topic_mask_cache_is_bounded(feed_db, monkeypatch):
+    """Word bitmasks are reset once the topic cap is reached"""
+    monkeypatch.setattr(InsightScorer, "TOPIC_MASK_CACHE_SIZE", 4)
+    monkeypatch.setattr(InsightScorer, "_token_bits", {})
+    monkeypatch.setattr(InsightScorer, "_topic_masks", {})
+    scorer = InsightScorer(feed_db)
+
+    for n in range(10):
+        assert scorer._calculate_topic_similarity(f"AI topic{n}", f"AI other{n}") == pytest.approx(1 / 3)
+        assert len(InsightScorer._topic_masks) <= 4
+        assert len(InsightScorer._token_bits) <= 6
+
+
+def test_user_preferences_cached_for_ttl(feed_db, monkeypatch):
+    """Parsed preferences are reused within the TTL, then re-checked"""
+    conn = sqlite3.connect(feed_db)
+    conn.execute("""
+        INSERT INTO user_preferences (user_id, liked_categories, saved_sources, topic_affinity, updated_at)
+        VALUES ('user-5', '{"CASE STUDY": 3}', '{}', '{}', '2024-01-01T00:00:00')
+    """)
+    conn.commit()
+
+    scorer = InsightScorer(feed_db)
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+
+    first = scorer._get_user_preferences("user-5", cursor)
+    assert first['liked_categories'] == {"CASE STUDY": 3}
+    assert first['_max_likes'] == 3
+    assert scorer._calculate_category_weight("CASE STUDY", first) == pytest.approx(1.0)
+    assert scorer._get_user_preferences("user-5", cursor) is first
+
+    conn.execute("""
+        UPDATE user_preferences
+        SET liked_categories = '{"CASE STUDY": 4}', updated_at = '2024-01-02T00:00:00'
+        WHERE user_id = 'user-5'
+    """)
+    conn.commit()
+
+    # Within the TTL the cached value is served without a lookup
+    assert scorer._get_user_preferences("user-5", cursor) is first
+
+    # Past the TTL, a changed updated_at triggers a re-parse
+    monkeypatch.setattr(InsightScorer, "PREFS_TTL_SECONDS", 0)
+    refreshed = scorer._get_user_preferences("user-5", cursor)
+    assert refreshed['liked_categories'] == {"CASE STUDY": 4}
+    assert refreshed['_max_likes'] == 4
+
+    # Other scorers keep their own cache
+    assert InsightScorer(feed_db)._prefs_cache == OrderedDict()
+    conn.close()
+
+
+def test_created_ts_matches_iso_parsing(feed_db):
+    """Stored created_at_epoch yields the same freshness as parsing created_at"""
+    _insert_insight(feed_db, "old", "AI agents", days_old=10)
+    conn = sqlite3.connect(feed_db)
+    created_at, created_ts = conn.execute(
+        "SELECT created_at, created_at_epoch FROM insights"
+    ).fetchone()
+    conn.close()
+    assert created_ts is not None
+
+    scorer = PersonalizedScorer()
+    assert scorer._calculate_freshness(created_at, 0.5, created_ts) == pytest.approx(
+        scorer._calculate_freshness(created_at, 0.5)
+    )
+
+    insight_scorer = InsightScorer(feed_db)
+    insight = {
+        "id": "old", "topic": "AI agents", "category": "INSIGHT",
+        "source_domain": "example.com", "quality_score": 8.0,
+        "engagement_score": 0.0, "created_at": created_at,
+    }
+    from_iso = insight_scorer.calculate_feed_score("user-6", insight, last_topic="Web3")
+    from_ts = insight_scorer.calculate_feed_score(
+        "user-6", dict(insight, created_ts=created_ts), last_topic="Web3"
+    )
+    assert from_ts == pytest.approx(from_iso)
+
+
+def test_record_engagement_updates_profile_in_same_transaction(feed_db):
+    """Profile counters and topic affinity are written with the engagement"""
+    _insert_insight(feed_db, "a1", "AI agents")
+    conn = sqlite3.connect(feed_db)
+    conn.execute("INSERT INTO user_profiles (user_id) VALUES ('user-7')")
+    conn.commit()
+    conn.close()
+
+    FeedService(feed_db).record_engagement("user-7", "a1", "like")
+
+    conn = sqlite3.connect(feed_db)
+    total_likes = conn.execute(
+        "SELECT total_likes FROM user_profiles WHERE user_id = 'user-7'"
+    ).fetchone()[0]
+    affinity = conn.execute(
+        "SELECT affinity_score FROM user_topic_affinities WHERE user_id = 'user-7' AND topic = 'AI agents'"
+    ).fetchone()[0]
+    conn.close()
+
+    assert total_likes == 1
+    assert affinity == pytest.approx(0.65)
+
+
+def test_rolled_back_engagement_is_not_counted(feed_db):
+    """Counters roll back with the caller's transaction"""
+    conn = sqlite3.connect(feed_db)
+    conn.execute("INSERT INTO user_profiles (user_id) VALUES ('user-8')")
+    conn.commit()
+
+    profiles = UserProfileService(feed_db)
+    profiles.record_engagement("user-8", "like", "AI agents", 0.15, conn.cursor())
+    conn.rollback()
+    conn.close()
+
+    assert profiles.get_or_create_profile("user-8").total_likes == 0
+    assert profiles.get_topic_affinities("user-8") == {}
+
+    profiles.record_engagement("user-8", "like", "AI agents", 0.15)
+    assert profiles.get_or_create_profile("user-8").total_likes == 1
+
+
+def test_feed_mv_tracks_insight_writes(feed_db):
+    """insight_feed_mv follows inserts, engagement updates and archiving"""
+    _insert_insight(feed_db, "a1", "AI agents", days_old=15)
+    _insert_insight(feed_db, "a2", "AI agents")
+
+    conn = sqlite3.connect(feed_db)
+    conn.execute("UPDATE insights SET engagement_score = 0.5 WHERE id = 'a1'")
+    conn.execute("UPDATE insights SET is_archived = 1 WHERE id = 'a2'")
+    conn.commit()
+    rows = conn.execute(
+        "SELECT id, engagement_score, freshness_cached FROM insight_feed_mv"
+    ).fetchall()
+    conn.close()
+
+    assert len(rows) == 1
+    assert rows[0][0] == "a1"
+    assert rows[0][1] == pytest.approx(0.5)
+    assert rows[0][2] == pytest.approx(0.5, abs=0.01)
+
+    assert FeedService(feed_db).refresh_feed_mv() == 1
+
+
+def test_following_feed_penalizes_last_shown_topic(feed_db):
+    """Following feed applies the last-topic diversity penalty in SQL"""
+    _insert_insight(feed_db, "a1", "AI agents", quality=9.0)
+    _insert_insight(feed_db, "a2", "AI agents", quality=9.0)
+    _insert_insight(feed_db, "w1", "Web3", quality=6.0)
+
+    service = FeedService(feed_db)
+    service.follow_topic("user-8", "AI agents")
+    service.follow_topic("user-8", "Web3")
+
+    first = service.generate_following_feed("user-8", limit=1)
+    assert first[0]["topic"] == "AI agents"
+
+    # Last shown topic is now "AI agents", so Web3 outranks the remaining one
+    second = service.generate_following_feed("user-8", limit=2)
+    assert [i["id"] for i in second][0] == "w1"
+    assert second[0]["score"] > second[1]["score"]
+
+
+def test_score_batch_matches_per_insight_scoring(feed_db):
+    """Batch scoring gives the same result as scoring insights one by one"""
+    for i, topic in enumerate(["AI agents", "AI safety", "Web3"]):
+        _insert_insight(feed_db, f"i{i}", topic, quality=6 + i)
+
+    service = FeedService(feed_db)
+    service.follow_topic("user-9", "AI agents")
+    service.record_engagement("user-9", "i0", "view")
+
+    conn = sqlite3.connect(feed_db)
+    conn.row_factory = sqlite3.Row
+    insights = [dict(r) for r in conn.execute("SELECT * FROM insights ORDER BY id")]
+    conn.close()
+
+    scorer = InsightScorer(feed_db)
+    assert scorer._score_batch("user-9", insights, 'following') == pytest.approx(
+        [scorer.calculate_feed_score("user-9", i) for i in insights]
+    )
+    assert scorer._score_batch("user-9", insights, 'for_you') == pytest.approx(
+        [scorer.predict_engagement("user-9", i) for i in insights]
+    )
+
+
+def test_engagement_counters_count_distinct_users(feed_db):
+    """Counter triggers keep distinct-user counts and the derived score"""
+    _insert_insight(feed_db, "a1", "AI agents")
+    service = FeedService(feed_db)
+
+    service.record_engagement("user-10", "a1", "view")
+    service.record_engagement("user-10", "a1", "view")  # repeat view, same user
+    service.record_engagement("user-11", "a1", "view")
+    service.record_engagement("user-10", "a1", "save")
+
+    conn = sqlite3.connect(feed_db)
+    row = conn.execute(
+        "SELECT views_count, likes_count, saves_count, engagement_score FROM insights WHERE id = 'a1'"
+    ).fetchone()
+    conn.close()
+
+    assert row[:3] == (2, 0, 1)
+    assert row[3] == pytest.approx(0.5)
+
+    # Repeat views are ignored by the (user_id, insight_id, action) constraint
+    assert _count_engagement(feed_db, "user-10", "view") == 1
+
+
+def test_engagement_rows_get_integer_ids(feed_db):
+    """user_engagement ids are assigned by SQLite, in insert order"""
+    _insert_insight(feed_db, "a1", "AI agents")
+    _insert_insight(feed_db, "a2", "AI agents")
+    service = FeedService(feed_db)
+    service.follow_topic("user-12", "AI agents")
+
+    service.generate_following_feed("user-12", limit=10)
+    service.record_engagement("user-12", "a1", "like")
+
+    conn = sqlite3.connect(feed_db)
+    ids = [row[0] for row in conn.execute(
+        "SELECT id FROM user_engagement WHERE user_id = 'user-12' ORDER BY rowid"
+    )]
+    conn.close()
+
+    assert len(ids) == 3
+    assert all(isinstance(i, int) for i in ids)
+    assert ids == sorted(ids)
+
+
+def test_exploration_insight_skips_seen(feed_db):
+    """Exploration picks come from unfamiliar topics and exclude viewed insights"""
+    from backend.services.feed_builder import FeedBuilder
+
+    _insert_insight(feed_db, "w1", "Web3", quality=9.0)
+    _insert_insight(feed_db, "w2", "Web3", quality=9.0)
+    _insert_insight(feed_db, "a1", "AI agents", quality=9.0)
+    FeedService(feed_db).record_engagement("user-13", "w1", "view")
+
+    builder = FeedBuilder(feed_db)
+    for _ in range(5):
+        pick = builder._get_exploration_insight("user-13", {"AI agents": 0.8}, exclude_ids=set())
+        assert pick["id"] == "w2"
+
+    assert builder._get_exploration_insight("user-13", {"AI agents": 0.8}, exclude_ids={"w2"}) is None
+
+
+def test_topic_affinity_upsert_clamps(feed_db):
+    """Affinity is created at 0.5 + delta, then accumulates within [0, 1]"""
+    profiles = UserProfileService(feed_db)
+    profiles.update_topic_affinity("user-14", "AI agents", 0.15)
+    assert profiles.get_topic_affinities("user-14") == {"AI agents": pytest.approx(0.65)}
+
+    for _ in range(4):
+        profiles.update_topic_affinity("user-14", "AI agents", 0.15)
+    assert profiles.get_topic_affinities("user-14") == {"AI agents": pytest.approx(1.0)}
+
+    profiles.update_topic_affinity("user-14", "Web3", -0.6)
+    assert profiles.get_topic_affinities("user-14")["Web3"] == 0.0
+
+    conn = sqlite3.connect(feed_db)
+    stored = conn.execute("""
+        SELECT last_engagement_epoch, CAST(strftime('%s', last_engagement_at) AS INTEGER)
+        FROM user_topic_affinities WHERE user_id = 'user-14'
+    """).fetchall()
+    conn.close()
+    assert all(epoch is not None and epoch == from_iso for epoch, from_iso in stored)
+
+
+def test_topic_affinities_decay_per_week(feed_db):
+    """Affinities decay 0.95 per week since last engagement"""
+    conn = sqlite3.connect(feed_db)
+    conn.executemany("""
+        INSERT INTO user_topic_affinities (user_id, topic, affinity_score, last_engagement_at)
+        VALUES ('user-15', ?, 0.8, ?)
+    """, [
+        ("AI agents", (datetime.now() - timedelta(weeks=8)).isoformat()),
+        ("Web3", None),
+    ])
+    conn.commit()
+    conn.close()
+
+    profiles = UserProfileService(feed_db)
+    assert profiles.get_topic_affinities("user-15") == {
+        "AI agents": pytest.approx(0.8 * 0.95 ** 8),
+        "Web3": pytest.approx(0.8),
+    }
+    assert profiles.get_topic_affinities("user-15", apply_decay=False)["AI agents"] == pytest.approx(0.8)
+
+
+def test_user_preferences_cache_is_bounded(feed_db, monkeypatch):
+    """The preferences cache evicts the least recently used user"""
+    monkeypatch.setattr(InsightScorer, "PREFS_CACHE_SIZE", 2)
+    conn = sqlite3.connect(feed_db)
+    conn.executemany("""
+        INSERT INTO user_preferences (user_id, liked_categories, saved_sources, topic_affinity, updated_at)
+        VALUES (?, '{}', '{}', '{}', '2024-01-01T00:00:00')
+    """, [("user-a",), ("user-b",), ("user-c",)])
+    conn.commit()
+
+    scorer = InsightScorer(feed_db)
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+
+    scorer._get_user_preferences("user-a", cursor)
+    scorer._get_user_preferences("user-b", cursor)
+    scorer._get_user_preferences("user-a", cursor)
+    scorer._get_user_preferences("user-c", cursor)
+
+    assert list(scorer._prefs_cache) == ["user-a", "user-c"]
+    conn.close()
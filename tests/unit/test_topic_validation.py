@@ -157,7 +157,7 @@ def test_full_validation_with_slm():
     failed = 0
 
     for topic, expected_valid, description in tests:
-        valid, error, suggestion = validate_topic(topic)
+        valid, error, suggestion = validate_topic(topic, deep=True)
 
         status = "✅" if valid == expected_valid else "❌"
         print(f"{status} '{topic}' ({description})")
@@ -209,6 +209,105 @@ def test_suggestions():
     return failed == 0
 
 
+def test_validation_cache_normalizes_topic():
+    """Repeat topics (any case/whitespace) are served from the cache"""
+    from backend.topic_validation import _validate_topic_cached
+
+    _validate_topic_cached.cache_clear()
+    first = validate_topic("AI agents")
+    again = validate_topic("  ai AGENTS ")
+
+    assert again == first
+    info = _validate_topic_cached.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_rule_validation_known_topics_and_gibberish(tmp_path, monkeypatch):
+    """Rule path rejects keyboard mashes and accepts already-followed topics"""
+    import sqlite3
+    from backend import topic_validation
+
+    assert validate_topic("asdf jkl")[0] is False
+    assert validate_topic("XYZ")[0] is False
+
+    db_path = str(tmp_path / "topics.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE user_topics (user_id TEXT, topic TEXT)")
+    conn.execute("INSERT INTO user_topics VALUES ('u1', 'XYZ')")
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(topic_validation, "known_topics", frozenset())
+    assert topic_validation.load_known_topics(db_path) == 1
+    assert validate_topic("xyz") == (True, "", "")
+    topic_validation._validate_topic_cached.cache_clear()
+
+
+def test_deep_validation_batches_concurrent_requests(monkeypatch):
+    """Concurrent deep validations share one batched SLM call"""
+    import asyncio
+    from backend import topic_validation
+
+    calls = []
+
+    def fake_pipeline(prompts, **kwargs):
+        calls.append(prompts)
+        return [[{"generated_text": "VALID\nReason: real topic\nSuggestion: none"}] for _ in prompts]
+
+    monkeypatch.setattr(topic_validation, "slm_pipeline", fake_pipeline)
+    monkeypatch.setattr(topic_validation, "slm_fallback_mode", False)
+    monkeypatch.setattr(topic_validation, "_slm_results", {})
+
+    async def run():
+        worker = asyncio.create_task(topic_validation.slm_batch_worker())
+        await asyncio.sleep(0)
+        try:
+            return await asyncio.gather(
+                topic_validation.validate_topic_async("AI agents", deep=True),
+                topic_validation.validate_topic_async("DeFi", deep=True),
+                topic_validation.validate_topic_async("f", deep=True),
+            )
+        finally:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert [valid for valid, _, _ in results] == [True, True, False]
+    assert len(calls) == 1 and len(calls[0]) == 2
+    assert topic_validation._slm_queue is None
+
+    # Sync deep callers reuse the batched verdicts
+    topic_validation._validate_topic_cached.cache_clear()
+    assert topic_validation.validate_topic("AI agents", deep=True)[0] is True
+    assert len(calls) == 1
+    topic_validation._validate_topic_cached.cache_clear()
+
+
+def test_cancelled_slm_worker_resolves_queued_requests(monkeypatch):
+    """Requests still queued when the worker stops get the fallback result"""
+    import asyncio
+    from backend import topic_validation
+
+    def stuck_pipeline(prompts, **kwargs):
+        raise AssertionError("worker should be cancelled before running a batch")
+
+    monkeypatch.setattr(topic_validation, "slm_pipeline", stuck_pipeline)
+    monkeypatch.setattr(topic_validation, "slm_fallback_mode", False)
+    monkeypatch.setattr(topic_validation, "_slm_results", {})
+
+    async def run():
+        worker = asyncio.create_task(topic_validation.slm_batch_worker())
+        await asyncio.sleep(0)
+        pending = asyncio.ensure_future(topic_validation.validate_topic_async("AI agents", deep=True))
+        await asyncio.sleep(0)  # queued, worker now collecting its batch
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+        return await asyncio.wait_for(pending, 1)
+
+    assert asyncio.run(run()) == topic_validation.fallback_validation("ai agents")
+
+
 def main():
     """Run all tests"""
     print("="*70)